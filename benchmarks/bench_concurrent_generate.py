@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Throughput of PathManager.generate when one manager is shared across workers.
+
+    python benchmarks/bench_concurrent_generate.py [--paths N] [--max-workers N]
+
+A thread pool shares a single manager and a single token dict between all
+threads; this only scales on a free-threaded build (CPython 3.13t+). On the
+standard build a process pool is run as well, with one manager per process.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from o_pathmanager.manager import PathManager
+
+STUDIO_CFG = Path(__file__).resolve().parents[1] / 'src' / 'o_pathmanager' / 'config' / 'default.yaml'
+
+TOKENS = {
+    'root': '/mnt/o/projects/VEL', 'seq': 'TD', 'shotCode': 'td0010', 'task': 'comp',
+    'show': 'vel', 'descriptor': 'final', 'version': 3, 'ext': 'EXR', 'eye': 'l',
+}
+
+_manager = None
+
+
+def _init_worker():
+    global _manager
+    _manager = PathManager([STUDIO_CFG])
+
+
+def _run(manager, tokens, count):
+    for _ in range(count):
+        manager.generate('work_render', tokens)
+    return count
+
+
+def _run_in_process(count):
+    return _run(_manager, TOKENS, count)
+
+
+def _bench(pool_cls, workers, total, shared):
+    chunk = total // workers
+    with pool_cls(max_workers=workers, **({} if shared else {'initializer': _init_worker})) as pool:
+        if not shared:
+            # warm the worker processes before timing
+            list(pool.map(_run_in_process, [1] * workers))
+        start = time.perf_counter()
+        if shared:
+            futures = [pool.submit(_run, shared, TOKENS, chunk) for _ in range(workers)]
+        else:
+            futures = [pool.submit(_run_in_process, chunk) for _ in range(workers)]
+        done = sum(f.result() for f in futures)
+        elapsed = time.perf_counter() - start
+    return done / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--paths', type=int, default=200_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}  GIL {'enabled' if gil else 'disabled'}  "
+          f"cpus {os.cpu_count()}  paths {args.paths}")
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_workers:
+        counts.append(counts[-1] * 2)
+
+    manager = PathManager([STUDIO_CFG])
+    snapshot = dict(TOKENS)
+    pools = [('threads', ThreadPoolExecutor, manager)]
+    if gil:
+        pools.append(('processes', ProcessPoolExecutor, None))
+
+    for label, pool_cls, shared in pools:
+        base = None
+        for workers in counts:
+            rate = _bench(pool_cls, workers, args.paths, shared)
+            base = base or rate
+            print(f"{label:>9} x{workers:<3} {rate:>12,.0f} paths/s  speedup {rate / base:5.2f}")
+
+    assert TOKENS == snapshot, "generate() mutated the shared token dict"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Generation throughput with the old and the current separator clean-up.
+
+    python benchmarks/bench_generate_batch.py [--shots N] [--versions N] [--repeat N]
+
+PatternFormatter used to run all four clean-up regexes on every path;
+it now only runs the ones whose trigger ("__", "/_", "_/", "//", an edge
+underscore) occurs in the path. Both are timed through PathManager on
+the batch shapes it is used for: every file template of many shots
+(generate_set) and many versions of one template (generate_many).
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+from o_pathmanager.formatter import PatternFormatter
+from o_pathmanager.manager import PathManager
+
+STUDIO_CFG = Path(__file__).resolve().parents[1] / 'src' / 'o_pathmanager' / 'config' / 'default.yaml'
+TOKENS = {
+    'root': '/mnt/o/projects/VEL', 'seq': 'TD', 'shotCode': 'td0010', 'task': 'comp',
+    'show': 'vel', 'descriptor': 'final', 'version': 3, 'ext': 'EXR', 'padding': '%04d',
+    'preset': 'Slap', 'sg_version_name': 'TD0010_comp_v003',
+}
+
+
+class RegexFormatter(PatternFormatter):
+    """The previous clean-up: every regex on every path."""
+
+    def cleanup(self, path: str) -> str:
+        path = self._MULTI_UNDER.sub("_", path)
+        path = self._UNDER_SLASH.sub("/", path)
+        path = self._EDGE_UNDER.sub("", path)
+        return self._MULTI_SLASH.sub("/", path)
+
+
+def _best(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--shots', type=int, default=200)
+    parser.add_argument('--versions', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+    print(f"Python {sys.version.split()[0]}  best of {args.repeat}")
+
+    old = PathManager([STUDIO_CFG], formatter=RegexFormatter())
+    new = PathManager([STUDIO_CFG])
+    names = [n for n in new.get_templates() if not n.startswith('sg_')]
+    shots = [dict(TOKENS, shotCode=f'td{s:04d}') for s in range(args.shots)]
+    versions = [('work_render', dict(TOKENS, version=v)) for v in range(1, args.versions + 1)]
+
+    cases = [
+        ('generate_set, shots x tpl', len(shots) * len(names),
+         lambda pm: [pm.generate_set(names, tokens) for tokens in shots]),
+        ('generate_many, versions', len(versions),
+         lambda pm: pm.generate_many(versions)),
+    ]
+    for label, count, run in cases:
+        assert run(old) == run(new)
+        before = _best(lambda: run(old), args.repeat)
+        after = _best(lambda: run(new), args.repeat)
+        print(f"{label:<26} {count:>6} paths  regex {before / count * 1e6:6.2f} us/path  "
+              f"fast path {after / count * 1e6:6.2f} us/path  speedup {before / after:5.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Worker start-up time and private memory for render-farm style pools.
+
+    python benchmarks/bench_worker_startup.py [--workers N] [--shows N]
+
+Compares building a PathManager in every worker (the current behaviour)
+with preloading in the parent before fork, and with a shared-memory
+template store for spawn pools. Memory is the sum of each worker's
+private (unshared) pages from /proc/<pid>/smaps_rollup, so Linux only.
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from o_pathmanager import preload as preload_mod
+from o_pathmanager.factory import PathManagerFactory
+from o_pathmanager.preload import SharedTemplateStore
+
+STUDIO_CFG = Path(__file__).resolve().parents[1] / 'src' / 'o_pathmanager' / 'config' / 'default.yaml'
+TOKENS = {'root': '/mnt/o/projects', 'seq': 'TD', 'shotCode': 'td0010', 'task': 'comp',
+          'show': 'vel', 'descriptor': 'final', 'version': 3, 'ext': 'exr'}
+
+_managers = {}
+
+
+def _private_kb() -> int:
+    total = 0
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total
+
+
+def _init_build(studio_cfg, projects_root, shows):
+    for show in shows:
+        _managers[show] = PathManagerFactory.create_for_show(studio_cfg, projects_root, show)
+
+
+def _init_preloaded(shows):
+    for show in shows:
+        _managers[show] = preload_mod.get_manager(show)
+
+
+def _init_shared(name, shows):
+    store = SharedTemplateStore.attach(name)
+    for show in shows:
+        _managers[show] = store.manager(show)
+    store.close()
+
+
+def _work(_):
+    for pm in _managers.values():
+        for _ in range(2000):
+            pm.generate('work_render', TOKENS)
+    return _private_kb()
+
+
+def _run(label, method, workers, initializer, initargs):
+    ctx = multiprocessing.get_context(method)
+    start = time.perf_counter()
+    with ctx.Pool(workers, initializer=initializer, initargs=initargs) as pool:
+        private = pool.map(_work, range(workers), chunksize=1)
+        elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f} s to serve all workers   "
+          f"{sum(private) / 1024:8.1f} MiB private")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--shows', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as projects_root:
+        projects_root = Path(projects_root)
+        shows = [f'SHOW{i:02d}' for i in range(args.shows)]
+        for show in shows:
+            (projects_root / show / 'configs').mkdir(parents=True)
+
+        print(f"{args.workers} workers, {args.shows} shows")
+        _run('spawn, build per worker', 'spawn', args.workers,
+             _init_build, (STUDIO_CFG, projects_root, shows))
+        _run('fork, build per worker', 'fork', args.workers,
+             _init_build, (STUDIO_CFG, projects_root, shows))
+
+        managers = preload_mod.preload(STUDIO_CFG, projects_root, shows)
+        _run('fork, preloaded', 'fork', args.workers, _init_preloaded, (shows,))
+
+        store = SharedTemplateStore.create(managers)
+        try:
+            _run('spawn, shared store', 'spawn', args.workers, _init_shared, (store.name, shows))
+        finally:
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
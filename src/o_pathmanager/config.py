@@ -3,6 +3,8 @@ import yaml
 import os
 from typing import Dict, Optional, Any
 
+from .probe import ProbeStrategy, default_probe
+
 class DotDict(dict):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -28,7 +30,7 @@ def _get_show() -> Optional[str]:
 def _get_deployment_type() -> Optional[str]:
     return os.getenv('USE_DEPLOYMENTS')
 
-def _find_project_config() -> Optional[Path]:
+def _find_project_config(probe: Optional[ProbeStrategy] = None) -> Optional[Path]:
     show = _get_show()
     if not show:
         return None
@@ -40,18 +42,27 @@ def _find_project_config() -> Optional[Path]:
         Path('O:/projects') / show / f'configs/o-pathmanager/{config_file}'
     ]
     
-    for path in possible_paths:
-        if path.exists():
+    probe = probe or default_probe
+    for path, found in zip(possible_paths, probe.exists_many(possible_paths)):
+        if found:
             return path
     return None
 
-def load_config(project_config: str = None) -> DotDict:
+def load_config(project_config: str = None, probe: Optional[ProbeStrategy] = None) -> DotDict:
+    probe = probe or default_probe
     # Always load default config first
     default_config_path = Path(__file__).parent / 'config' / 'default.yaml'
+    deployment_type = _get_deployment_type()
+    deployment_config_path = (
+        Path(__file__).parent / 'config' / f'default-{deployment_type}.yaml'
+        if deployment_type else None
+    )
     # Get top level package name
 
     print(f"Loading default config from: {default_config_path}")
-    if not default_config_path.exists():
+    found = probe.exists_many([p for p in (default_config_path, deployment_config_path) if p])
+    default_found, deployment_found = found[0], found[1:] == [True]
+    if not default_found:
         raise FileNotFoundError(f"Default config not found at {default_config_path}")
     
     with default_config_path.open('r') as f:
@@ -59,10 +70,8 @@ def load_config(project_config: str = None) -> DotDict:
         config['default_config_path'] = str(default_config_path)
     
     # Load deployment-specific config if environment variable is set
-    deployment_type = _get_deployment_type()
     if deployment_type:
-        deployment_config_path = Path(__file__).parent / 'config' / f'default-{deployment_type}.yaml'
-        if deployment_config_path.exists():
+        if deployment_found:
             print(f"Loading {deployment_type} overrides from: {deployment_config_path}")
             with deployment_config_path.open('r') as f:
                 deployment_settings = yaml.safe_load(f) or {}
@@ -70,14 +79,17 @@ def load_config(project_config: str = None) -> DotDict:
         else:
             print(f"Deployment config not found at: {deployment_config_path}")
 
-    # Try to load project config if not explicitly provided
+    # Try to load project config if not explicitly provided; a path found
+    # by the lookup has already been probed
+    project_found = False
     if project_config is None:
-        project_config = _find_project_config()
+        project_config = _find_project_config(probe)
+        project_found = project_config is not None
     
     # Override with project config if available
     if project_config:
         project_path = Path(project_config)
-        if project_path.exists():
+        if project_found or probe.exists(project_path):
             print(f"Loading project config from: {project_path}")
             with project_path.open('r') as f:
                 project_settings = yaml.safe_load(f) or {}
@@ -8,6 +8,7 @@ from .transformer import StringTransformerStrategy
 from .validator import TokenValidatorStrategy
 from .formatter import PatternFormatter
 from .os_formatter import OSPathFormatter
+from .probe import ProbeStrategy, default_probe
 
 class PathManagerFactory:
 
@@ -15,7 +16,8 @@ class PathManagerFactory:
     def create_for_project(
         studio_cfg: Path,
         override_cfg: Optional[Path] = None,
-        default_os=None
+        default_os=None,
+        probe: Optional[ProbeStrategy] = None
     ) -> PathManager:
         """
         Build a PathManager from one or two YAMLs.
@@ -28,11 +30,12 @@ class PathManagerFactory:
         return PathManager(
             config_paths,
             default_os,
-            loader=YamlDeepMergeLoader(),
+            loader=YamlDeepMergeLoader(probe),
             transformer=StringTransformerStrategy(),
             validator=TokenValidatorStrategy(),
             formatter=PatternFormatter(),
             os_formatter=OSPathFormatter(),
+            probe=probe,
         )
 
     @staticmethod
@@ -40,7 +43,8 @@ class PathManagerFactory:
         studio_cfg: Path,
         projects_root: Path,
         show_name: str,
-        default_os=None
+        default_os=None,
+        probe: Optional[ProbeStrategy] = None
     ) -> PathManager:
         """
         Look for overrides.yaml under projects_root/show_name/configs.
@@ -53,16 +57,21 @@ class PathManagerFactory:
         print(f"[DEBUG] studio_cfg: {studio_cfg}")
         print(f"[DEBUG] overrides path: {over}")
 
-        if not studio_cfg.exists():
-            raise ValueError(f"Invalid studio_cfg: {studio_cfg}")
+        probe = probe or default_probe
+        with probe.metered() as meter:
+            studio_found, over_found = probe.exists_many([studio_cfg, over])
+            if not studio_found:
+                raise ValueError(f"Invalid studio_cfg: {studio_cfg}")
 
-        if over.exists():
-            # merge default + project overrides
-            return PathManagerFactory.create_for_project(
-                studio_cfg, over, default_os
-            )
-        else:
-            # no overrides file → just load the studio config
-            return PathManagerFactory.create_for_project(
-                studio_cfg, None, default_os
-            )
+            if over_found:
+                # merge default + project overrides
+                pm = PathManagerFactory.create_for_project(
+                    studio_cfg, over, default_os, probe
+                )
+            else:
+                # no overrides file → just load the studio config
+                pm = PathManagerFactory.create_for_project(
+                    studio_cfg, None, default_os, probe
+                )
+        pm.build_syscalls = meter.syscalls
+        return pm
@@ -28,11 +28,17 @@ class PatternFormatter(FormatterStrategy):
     _EDGE_UNDER  = re.compile(r"^_+|_+$")      # leading or trailing _
     _MULTI_SLASH = re.compile(r"/{2,}")        # //// → /
 
-    def _cleanup(self, path: str) -> str:
-        path = self._MULTI_UNDER.sub("_", path)
-        path = self._UNDER_SLASH.sub("/", path)
-        path = self._EDGE_UNDER.sub("", path)
-        path = self._MULTI_SLASH.sub("/", path)
+    def cleanup(self, path: str) -> str:
+        """Apply the separator clean-up rules to an already filled path."""
+        # each rule only runs if its trigger is present; most paths need none
+        if "__" in path:
+            path = self._MULTI_UNDER.sub("_", path)
+        if "/_" in path or "_/" in path:
+            path = self._UNDER_SLASH.sub("/", path)
+        if path[:1] == "_" or path[-1:] == "_":
+            path = self._EDGE_UNDER.sub("", path)
+        if "//" in path:
+            path = self._MULTI_SLASH.sub("/", path)
         return path
 
     # ------------------------------------------------------------------ #
@@ -59,4 +65,4 @@ class PatternFormatter(FormatterStrategy):
         '/show/SQ001/SH010_comp_v001'
         """
         filled = pattern.format(**tokens)
-        return self._cleanup(filled)
\ No newline at end of file
+        return self.cleanup(filled)
\ No newline at end of file
@@ -3,9 +3,10 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import List, Dict
-import yaml
 import copy
 
+from .probe import ProbeStrategy, default_probe
+
 class TemplateLoaderStrategy(ABC):
     @abstractmethod
     def load(self, config_paths: List[Path]) -> Dict[str, dict]:
@@ -13,6 +14,9 @@ class TemplateLoaderStrategy(ABC):
         pass
 
 class YamlDeepMergeLoader(TemplateLoaderStrategy):
+    def __init__(self, probe: ProbeStrategy = None):
+        self._probe = probe or default_probe
+
     def load(self, config_paths: List[Path]) -> Dict[str, dict]:
         templates: Dict[str, dict] = {}
 
@@ -22,17 +26,23 @@ class YamlDeepMergeLoader(TemplateLoaderStrategy):
         for path in config_paths:
             if path is None:
                 raise ValueError("One of the config paths is None.")
-            if not path.exists():
+        for path, found in zip(config_paths, self._probe.exists_many(config_paths)):
+            if not found:
                 raise FileNotFoundError(f"Config path does not exist: {path}")
 
-        for path in config_paths:
-            if not path.exists():
-                print(f"[WARNING] Config file '{path}' not found, skipping.")
-                continue
+        # imported here so managers built from preloaded templates never pay for it
+        import yaml
 
+        for path in config_paths:
+            try:
+                text = path.read_text(encoding='utf-8')
+            except OSError:
+                # the probe's "found" was stale; don't let it vouch again
+                self._probe.invalidate(path)
+                raise
             try:
-                data = yaml.safe_load(path.read_text(encoding='utf-8')) or {}
-            except Exception as e:
+                data = yaml.safe_load(text) or {}
+            except yaml.YAMLError as e:
                 print(f"[ERROR] Failed to parse YAML at {path}: {e}")
                 continue
 
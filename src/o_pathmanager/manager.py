@@ -1,13 +1,125 @@
 # manager.py
 from pathlib import Path
-import copy
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import os
 from .loader        import TemplateLoaderStrategy, YamlDeepMergeLoader
 from .transformer   import TransformStrategy, StringTransformerStrategy
 from .validator     import ValidationStrategy, TokenValidatorStrategy
 from .formatter     import PatternFormatter
 from .os_formatter  import OSPathFormatter
+from .parser        import TemplateParser
+from .probe         import CachingFileProbe, ProbeStrategy, default_probe
+from .trie          import TemplateTrie
+from .publish       import Publisher, PublishReport, destinations
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _thaw(value: Any) -> Any:
+    """Inverse of `_freeze`: plain, mutable dicts and lists."""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+def make_dirs(directories: Iterable[Path],
+              dry_run: bool = False,
+              max_workers: Optional[int] = None) -> List[Path]:
+    """
+    Create `directories` and their missing ancestors.
+
+    Directories are de-duplicated together with their ancestors. Existing
+    ones are found with one batched probe per level (nothing below a
+    missing directory is probed); the probe is private to the call, so
+    nothing is cached across calls. Only the missing ones are created,
+    level by level with siblings in parallel. If any of them cannot be
+    created, the ones this call made are removed again and the error is
+    raised. With `dry_run` nothing is created and the plan, the same list
+    a real run would create, is returned instead.
+
+    Returns the directories created (or planned), parents first.
+    """
+    # 1) Expand to all ancestors and group them by depth
+    levels: Dict[int, set] = {}
+    for leaf in directories:
+        leaf = Path(leaf)
+        for directory in (leaf, *leaf.parents):
+            if directory == Path(directory.anchor) or directory == Path('.'):
+                continue
+            levels.setdefault(len(directory.parts), set()).add(directory)
+
+    # 2) Keep only what is missing; below a missing directory everything is
+    #    missing too, so only the children of existing directories are probed
+    probe = CachingFileProbe(positive_ttl=0, negative_ttl=0, max_workers=max_workers or 8)
+    missing: Dict[int, List[Path]] = {}
+    known_missing = set()
+    for depth in sorted(levels):
+        level = sorted(levels[depth])
+        inherited = [d for d in level if d.parent in known_missing]
+        unknown = [d for d in level if d.parent not in known_missing]
+        found = probe.exists_many(unknown)
+        absent = inherited + [d for d, ok in zip(unknown, found) if not ok]
+        if absent:
+            missing[depth] = sorted(absent)
+            known_missing.update(absent)
+    if dry_run:
+        return [d for depth in sorted(missing) for d in missing[depth]]
+
+    # 3) Create top-down; a level only starts once its parents exist
+    created: List[Path] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for depth in sorted(missing):
+            level = missing[depth]
+            futures = [pool.submit(_mkdir, d) for d in level]
+            error: Optional[BaseException] = None
+            for directory, future in zip(level, futures):
+                try:
+                    if future.result():
+                        created.append(directory)
+                except BaseException as e:
+                    error = error or e
+            if error is not None:
+                remove_dirs(created)
+                raise error
+    return created
+
+def remove_dirs(directories: List[Path]) -> None:
+    """Remove `directories` (parents first, as `make_dirs` returns them) if still empty."""
+    for directory in reversed(directories):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+def _mkdir(directory: Path) -> bool:
+    try:
+        os.mkdir(directory)
+    except FileExistsError:
+        if not directory.is_dir():
+            raise
+        return False
+    return True
 
 class PathManager:
+    """
+    Generate paths from named templates.
+
+    Thread safety: once constructed, a PathManager only holds immutable
+    state (templates are frozen into read-only mappings and tuples, the
+    strategies are stateless after `prepare`). `generate` works on a
+    private copy of `tokens` and never mutates the caller's dict, so one
+    manager and one set of token templates can be shared freely between
+    threads without locks or defensive copies.
+    """
+
     def __init__(self,
                  config_paths,
                  default_os=None,
@@ -15,7 +127,8 @@ class PathManager:
                  transformer: TransformStrategy = None,
                  validator: ValidationStrategy = None,
                  formatter: PatternFormatter = None,
-                 os_formatter: OSPathFormatter = None):
+                 os_formatter: OSPathFormatter = None,
+                 probe: ProbeStrategy = None):
         # Validate config_paths
         if not config_paths:
             raise ValueError("config_paths cannot be empty.")
@@ -24,25 +137,142 @@ class PathManager:
                 raise ValueError("One of the config paths is None.")
             if not isinstance(path, Path):
                 raise TypeError(f"Expected Path object, got {type(path)}: {path}")
-            if not path.exists():
-                raise FileNotFoundError(f"Config path does not exist: {path}")
+        probe = probe or default_probe
+        with probe.metered() as meter:
+            for path, found in zip(config_paths, probe.exists_many(config_paths)):
+                if not found:
+                    raise FileNotFoundError(f"Config path does not exist: {path}")
 
+            self._probe  = probe
+            self._loader = loader or YamlDeepMergeLoader(probe)
+            self._setup(self._loader.load(config_paths), default_os,
+                        transformer, validator, formatter, os_formatter)
+        # real filesystem probes made by this thread while building the
+        # manager; PathManagerFactory widens it to cover its own lookups
+        self.build_syscalls = meter.syscalls
+
+    @classmethod
+    def from_templates(cls,
+                       templates: Dict[str, dict],
+                       default_os=None,
+                       transformer: TransformStrategy = None,
+                       validator: ValidationStrategy = None,
+                       formatter: PatternFormatter = None,
+                       os_formatter: OSPathFormatter = None) -> 'PathManager':
+        """Build a manager from already-merged templates, without reading any config."""
+        self = cls.__new__(cls)
+        self._probe  = default_probe
+        self._loader = None
+        self._setup(templates, default_os, transformer, validator, formatter, os_formatter)
+        self.build_syscalls = 0
+        return self
+
+    def _setup(self, templates, default_os, transformer, validator, formatter, os_formatter):
         self._default_os   = default_os
-        self._loader       = loader       or YamlDeepMergeLoader()
         self._transformer  = transformer  or StringTransformerStrategy()
         self._validator    = validator    or TokenValidatorStrategy()
         self._formatter    = formatter    or PatternFormatter()
         self._os_formatter = os_formatter or OSPathFormatter()
-        self._templates    = self._loader.load(config_paths)
+        self._templates    = _freeze(templates)
+        self._validator.prepare(self._templates)
+        self._parser       = TemplateParser(self._templates)
+        self._trie         = TemplateTrie(self._templates)
 
     def get_templates(self):
-        """Expose the raw templates dict so callers can introspect."""
-        return self._templates
+        """Return a mutable copy of the templates so callers can introspect."""
+        return _thaw(self._templates)
+
+    def parse(self, path, names=None):
+        """
+        Match a generated path back to a template.
+
+        Returns (template name, tokens) or None. `names` restricts the
+        templates that are tried.
+        """
+        if not isinstance(path, str):
+            path = path.as_posix()
+        candidates = self._trie.candidates(path)
+        if names is not None:
+            wanted = set(names)
+            candidates = [n for n in candidates if n in wanted]
+        return self._parser.parse(path, candidates)
 
     def generate(self, name, tokens, os_name=None):
+        """Fill template `name` with `tokens`."""
+        filled, _ = self._fill(name, tokens)
+        target = os_name or self._default_os
+        if target:
+            return self._os_formatter.make_path(target, filled)
+        return Path(filled)
+
+    def generate_many(self,
+                      requests: Iterable[Tuple[str, dict]],
+                      os_name=None) -> List:
+        """
+        Generate a path for every (name, tokens) pair.
+
+        Tokens are validated per template as columns (see
+        `ValidationStrategy.validate_batch`) once the whole batch has been
+        transformed, so each distinct value is checked once.
+        """
+        target = os_name or self._default_os
+        filled = self._fill_many(requests)
+        if target:
+            return [self._os_formatter.make_path(target, f) for f in filled]
+        return [Path(f) for f in filled]
+
+    def generate_set(self,
+                     names: Iterable[str],
+                     tokens: dict,
+                     os_name=None) -> Dict[str, Any]:
+        """Generate several templates for the same tokens, e.g. every path of one shot."""
+        names = list(names)
+        return dict(zip(names, self.generate_many([(n, tokens) for n in names], os_name)))
+
+    def _fill(self, name, tokens) -> Tuple[str, dict]:
+        """
+        Run the token pipeline for `name`. Returns the filled pattern and
+        the transformed tokens it was built from, before eye mapping.
+        """
+        tpl, tokens = self._prepare(name, tokens)
+        final = self._map_eye(tokens)
+
+        # 6) Validate final tokens
+        self._validator.validate(name, final, tpl)
+
+        # 7) Interpolate into pattern
+        return self._formatter.format(tpl['pattern'], final), tokens
+
+    def _fill_many(self, requests: Iterable[Tuple[str, dict]]) -> List[str]:
+        """`_fill` for a batch, validating each template's rows as columns."""
+        prepared = []
+        for name, tokens in requests:
+            tpl, tokens = self._prepare(name, tokens)
+            prepared.append((name, tpl, self._map_eye(tokens)))
+
+        rows: Dict[str, List[dict]] = {}
+        for name, _, tokens in prepared:
+            rows.setdefault(name, []).append(tokens)
+        for name, group in rows.items():
+            if len(group) == 1:
+                self._validator.validate(name, group[0], self._templates[name])
+                continue
+            keys = dict.fromkeys(k for tokens in group for k in tokens)
+            columns = {k: [tokens.get(k) for tokens in group] for k in keys}
+            self._validator.validate_batch(name, columns, self._templates[name])
+
+        return [self._formatter.format(tpl['pattern'], tokens) for _, tpl, tokens in prepared]
+
+    def _prepare(self, name, tokens) -> Tuple[Any, dict]:
+        """
+        Steps 1-4 of the pipeline: the template and a private copy of
+        `tokens`, completed and transformed.
+        """
         if name not in self._templates:
             raise KeyError(f"No template '{name}'")
-        tpl = copy.deepcopy(self._templates[name])
+        tpl = self._templates[name]
+        # Work on a private copy; the caller's dict is never mutated
+        tokens = dict(tokens)
 
         # 1) Required tokens
         for req in tpl.get('required_tokens', []):
@@ -64,21 +294,64 @@ class PathManager:
 
         # 4) Apply all other string transforms (lowercase, uppercase, etc.)
         tokens = self._transformer.apply(tpl.get('transforms', {}), tokens)
+        return tpl, tokens
 
-        # 5) Special‐case eye mapping
+    @staticmethod
+    def _map_eye(tokens: dict) -> dict:
+        """Step 5: `tokens` with a stereo eye replaced by its placeholder."""
         eye = tokens.get('eye')
         if eye in ('l', 'r'):
-            tokens['eye'] = '%v'
-        elif eye in ('left', 'right'):
-            tokens['eye'] = '%V'
+            return dict(tokens, eye='%v')
+        if eye in ('left', 'right'):
+            return dict(tokens, eye='%V')
         # (If eye was empty or something else, we leave it as-is.)
+        return tokens
 
-        # 6) Validate final tokens
-        self._validator.validate(name, tokens, tpl)
+    def materialize(self,
+                    templates: Iterable[str],
+                    tokens_iterable: Iterable[dict],
+                    dry_run: bool = False,
+                    max_workers: Optional[int] = None) -> List[Path]:
+        """
+        Create every directory produced by the directory-style `templates`
+        (patterns ending in '/') for each token set in `tokens_iterable`.
 
-        # 7) Interpolate into pattern and return Path / OS-specific path
-        filled = self._formatter.format(tpl['pattern'], tokens)
-        target = os_name or self._default_os
-        if target:
-            return self._os_formatter.make_path(target, filled)
-        return Path(filled)
+        All paths are generated up front and created with `make_dirs`:
+        batched probes per level, only the missing directories created,
+        and nothing left behind if one of them fails. With `dry_run` the
+        plan is returned instead.
+
+        Returns the directories created (or planned), parents first.
+        """
+        names = list(templates)
+        for name in names:
+            if name not in self._templates:
+                raise KeyError(f"No template '{name}'")
+            if not self._templates[name]['pattern'].endswith('/'):
+                raise ValueError(f"Template '{name}' is not a directory template")
+
+        # 1) Generate every leaf directory once
+        requests = [(name, tokens) for tokens in tokens_iterable for name in names]
+        leaves = {Path(filled) for filled in self._fill_many(requests)}
+
+        # 2) Create them and their missing ancestors
+        return make_dirs(leaves, dry_run, max_workers)
+
+    def publish(self,
+                name: str,
+                tokens: dict,
+                sources: Iterable[Path],
+                mode: str = 'copy',
+                max_workers: int = 8) -> PublishReport:
+        """
+        Publish `sources` to the paths generated by template `name`.
+
+        For sequence templates each source's frame number fills the
+        padding placeholder, so a whole frame range is mapped in one pass.
+        `mode` is 'copy', 'hardlink' or 'reflink'; see Publisher.
+        """
+        sources = [Path(s) for s in sources]
+        # the eye is resolved from the transformed token, e.g. 'L' -> 'l'
+        filled, transformed = self._fill(name, tokens)
+        targets = destinations(filled, sources, transformed)
+        return Publisher(max_workers).publish(zip(sources, targets), mode)
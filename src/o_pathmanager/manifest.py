@@ -0,0 +1,289 @@
+# pathmanager/manifest.py
+
+import mmap
+import os
+import struct
+from pathlib import Path, PurePath
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+_MAGIC = b'OPMF'
+_VERSION = 1
+# magic, version, block size, entry count, block count, index offset, strings offset
+_HEADER = struct.Struct('<4sHHQQQQ')
+
+
+class ManifestEntry(NamedTuple):
+    path: str
+    template: str
+    tokens: Dict[str, str]
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(buf, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _as_posix(path) -> str:
+    if isinstance(path, str):
+        return path
+    if isinstance(path, PurePath):
+        return path.as_posix()
+    return os.fspath(path)
+
+
+def _pad8(out: bytearray) -> None:
+    out.extend(b'\0' * (-len(out) % 8))
+
+
+class ManifestWriter:
+    """
+    Write a sorted, front-coded manifest of generated paths.
+
+    Paths are sorted and stored in blocks of `block_size`: the first path
+    of a block is stored whole, every other one as the length it shares
+    with its predecessor plus the differing suffix, so the repeated
+    ``{root}/seq/{seq}/{shotCode}/{task}/`` prefix costs a byte or two.
+    Template names, token names and token values go into one string
+    table and entries refer to them by index. Entries are buffered in
+    memory and written (atomically) on `close`.
+
+    Example
+    -------
+    >>> with ManifestWriter("show.opm") as w:
+    ...     w.add(pm.generate("work_files", tokens), "work_files", tokens)
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], block_size: int = 64):
+        if not 1 <= block_size <= 0xFFFF:
+            raise ValueError(f"block_size must be between 1 and 65535, got {block_size}")
+        self._path = Path(path)
+        self._block_size = block_size
+        self._entries: Dict[bytes, Tuple[int, Tuple[Tuple[int, int], ...]]] = {}
+        self._strings: Dict[str, int] = {}
+
+    def _intern(self, value: str) -> int:
+        return self._strings.setdefault(value, len(self._strings))
+
+    def add(self, path, template: str, tokens: Optional[Dict[str, object]] = None) -> None:
+        """Record `path`; a later add for the same path replaces the earlier one."""
+        path = _as_posix(path)
+        pairs = tuple((self._intern(k), self._intern(str(v)))
+                      for k, v in (tokens or {}).items())
+        self._entries[path.encode('utf-8')] = (self._intern(template), pairs)
+
+    def __enter__(self) -> 'ManifestWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+
+    def close(self) -> None:
+        keys = sorted(self._entries)
+        body = bytearray(_HEADER.size)
+        offsets: List[int] = []
+        prev = b''
+        for i, key in enumerate(keys):
+            if i % self._block_size == 0:
+                offsets.append(len(body))
+                prev = b''
+            shared = 0
+            limit = min(len(prev), len(key))
+            while shared < limit and prev[shared] == key[shared]:
+                shared += 1
+            _put_varint(body, shared)
+            _put_varint(body, len(key) - shared)
+            body += key[shared:]
+            template, pairs = self._entries[key]
+            _put_varint(body, template)
+            _put_varint(body, len(pairs))
+            for k, v in pairs:
+                _put_varint(body, k)
+                _put_varint(body, v)
+            prev = key
+
+        _pad8(body)
+        index_offset = len(body)
+        body += struct.pack(f'<{len(offsets)}Q', *offsets)
+
+        strings_offset = len(body)
+        encoded = [s.encode('utf-8') for s in self._strings]
+        pos = 0
+        starts = []
+        for s in encoded:
+            starts.append(pos)
+            pos += len(s)
+        starts.append(pos)
+        body += struct.pack(f'<Q{len(starts)}Q', len(encoded), *starts)
+        for s in encoded:
+            body += s
+
+        _HEADER.pack_into(body, 0, _MAGIC, _VERSION, self._block_size,
+                          len(keys), len(offsets), index_offset, strings_offset)
+
+        tmp = self._path.with_name(f".{self._path.name}.tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, self._path)
+
+
+def write_manifest(path: Union[str, os.PathLike],
+                   entries: Iterable[Tuple[object, str, Dict[str, object]]],
+                   block_size: int = 64) -> None:
+    """Write (path, template, tokens) triples to a manifest at `path`."""
+    with ManifestWriter(path, block_size) as writer:
+        for entry_path, template, tokens in entries:
+            writer.add(entry_path, template, tokens)
+
+
+class ManifestReader:
+    """
+    Memory-mapped reader for manifests written by ManifestWriter.
+
+    Nothing is loaded up front: the block index and string table are
+    read straight from the mapping, `find` binary-searches the first
+    path of each block and then decodes a single block, and iteration
+    streams the blocks in order.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self._block_size, self._count, n_blocks,
+         index_offset, strings_offset) = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f"Not an o-pathmanager manifest (v{_VERSION}): {path}")
+        # offsets are little-endian; the native cast assumes a little-endian host
+        view = memoryview(self._mm)
+        self._blocks = view[index_offset:index_offset + 8 * n_blocks].cast('Q')
+        n_strings = struct.unpack_from('<Q', self._mm, strings_offset)[0]
+        starts_at = strings_offset + 8
+        self._string_starts = view[starts_at:starts_at + 8 * (n_strings + 1)].cast('Q')
+        self._string_base = starts_at + 8 * (n_strings + 1)
+        self._string_cache: Dict[int, str] = {}
+
+    def close(self) -> None:
+        self._blocks.release()
+        self._string_starts.release()
+        self._mm.close()
+
+    def __enter__(self) -> 'ManifestReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ------------------------------------------------------------------ #
+    # decoding
+    # ------------------------------------------------------------------ #
+
+    def _string(self, index: int) -> str:
+        value = self._string_cache.get(index)
+        if value is None:
+            start = self._string_base + self._string_starts[index]
+            end = self._string_base + self._string_starts[index + 1]
+            value = self._string_cache[index] = self._mm[start:end].decode('utf-8')
+        return value
+
+    def _decode_block(self, block: int) -> Iterator[Tuple[bytes, tuple]]:
+        """Yield (path bytes, (template idx, token pairs)) for one block."""
+        mm = self._mm
+        pos = self._blocks[block]
+        n = min(self._block_size, self._count - block * self._block_size)
+        prev = b''
+        for _ in range(n):
+            shared, pos = _get_varint(mm, pos)
+            length, pos = _get_varint(mm, pos)
+            key = prev[:shared] + mm[pos:pos + length]
+            pos += length
+            template, pos = _get_varint(mm, pos)
+            n_tokens, pos = _get_varint(mm, pos)
+            pairs = []
+            for _ in range(n_tokens):
+                k, pos = _get_varint(mm, pos)
+                v, pos = _get_varint(mm, pos)
+                pairs.append((k, v))
+            yield key, (template, pairs)
+            prev = key
+
+    def _entry(self, key: bytes, record: tuple) -> ManifestEntry:
+        template, pairs = record
+        return ManifestEntry(
+            key.decode('utf-8'),
+            self._string(template),
+            {self._string(k): self._string(v) for k, v in pairs},
+        )
+
+    def _first_key(self, block: int) -> bytes:
+        pos = self._blocks[block]
+        _, pos = _get_varint(self._mm, pos)   # always 0 at a block start
+        length, pos = _get_varint(self._mm, pos)
+        return self._mm[pos:pos + length]
+
+    # ------------------------------------------------------------------ #
+    # access
+    # ------------------------------------------------------------------ #
+
+    def __iter__(self) -> Iterator[ManifestEntry]:
+        for block in range(len(self._blocks)):
+            for key, record in self._decode_block(block):
+                yield self._entry(key, record)
+
+    def paths(self) -> Iterator[str]:
+        """Stream just the paths, in sorted order."""
+        for block in range(len(self._blocks)):
+            for key, _ in self._decode_block(block):
+                yield key.decode('utf-8')
+
+    def __getitem__(self, index: int) -> ManifestEntry:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("manifest index out of range")
+        block, offset = divmod(index, self._block_size)
+        for i, (key, record) in enumerate(self._decode_block(block)):
+            if i == offset:
+                return self._entry(key, record)
+
+    def find(self, path) -> int:
+        """Index of `path` in sorted order, or -1."""
+        key = _as_posix(path).encode('utf-8')
+        lo, hi = 0, len(self._blocks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._first_key(mid) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        block = lo - 1
+        if block < 0:
+            return -1
+        for i, (candidate, _) in enumerate(self._decode_block(block)):
+            if candidate == key:
+                return block * self._block_size + i
+            if candidate > key:
+                break
+        return -1
+
+    def get(self, path) -> Optional[ManifestEntry]:
+        index = self.find(path)
+        return None if index < 0 else self[index]
+
+    def __contains__(self, path) -> bool:
+        return self.find(path) >= 0
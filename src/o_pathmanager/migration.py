@@ -0,0 +1,258 @@
+# pathmanager/migration.py
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .manager import PathManager, make_dirs, remove_dirs
+
+# progress(files_seen, elapsed_seconds)
+ProgressCallback = Callable[[int, float], None]
+
+_EYE_PLACEHOLDERS = {'l': '%v', 'r': '%v', 'left': '%V', 'right': '%V'}
+
+
+@dataclass(frozen=True)
+class RenameOp:
+    """One planned move. `status` is 'rename', 'collision' or 'error'."""
+    src: Path
+    dst: Optional[Path]
+    template: str
+    status: str = 'rename'
+    reason: str = ''
+
+
+class MigrationRollbackError(RuntimeError):
+    """A migration failed and some of its renames could not be undone."""
+
+    def __init__(self, failures: List[Tuple[RenameOp, OSError]]):
+        self.failures = failures
+        lines = "\n".join(f"  {op.dst} -> {op.src}: {e}" for op, e in failures)
+        super().__init__(f"Rollback left {len(failures)} file(s) at their new path:\n{lines}")
+
+
+@dataclass
+class MigrationReport:
+    renamed: int
+    seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        return self.renamed / self.seconds if self.seconds else 0.0
+
+
+def diff_templates(old: Dict[str, dict], new: Dict[str, dict]) -> Dict[str, str]:
+    """Return {template name: 'added' | 'removed' | 'changed'} for templates whose output differs."""
+    changes: Dict[str, str] = {}
+    for name in old.keys() | new.keys():
+        if name not in new:
+            changes[name] = 'removed'
+        elif name not in old:
+            changes[name] = 'added'
+        elif old[name] != new[name]:
+            changes[name] = 'changed'
+    return changes
+
+
+class MigrationPlanner:
+    """
+    Plan and apply the renames needed when a show's templates change.
+
+    Both template sets are loaded through the regular PathManager pipeline
+    (YamlDeepMergeLoader by default). Every file under the given roots is
+    parsed against the old templates and regenerated with the new ones;
+    files whose path changes become RenameOp entries.
+
+    Example
+    -------
+    >>> planner = MigrationPlanner([studio, old_overrides], [studio, new_overrides])
+    >>> ops = list(planner.plan([Path('/mnt/o/projects/VEL/seq')]))
+    >>> planner.execute(ops)
+    """
+
+    def __init__(self,
+                 old_config_paths: Sequence[Path],
+                 new_config_paths: Sequence[Path],
+                 **manager_kwargs):
+        self._old = PathManager(list(old_config_paths), **manager_kwargs)
+        self._new = PathManager(list(new_config_paths), **manager_kwargs)
+        old_templates = self._old.get_templates()
+        self._changes = diff_templates(old_templates, self._new.get_templates())
+        # files are parsed against every old file template, but only those
+        # that exist on both sides and changed produce renames
+        self._file_templates = [
+            name for name, tpl in old_templates.items()
+            if not tpl['pattern'].endswith('/')
+        ]
+        self._migrated = {
+            name for name in self._file_templates if self._changes.get(name) == 'changed'
+        }
+        # parsed values equal to an old default are dropped before
+        # regenerating, so a changed default reaches the new path
+        self._old_defaults = {
+            name: {k: str(v) for k, v in (old_templates[name].get('default_tokens') or {}).items()}
+            for name in self._migrated
+        }
+
+    def changed_templates(self) -> Dict[str, str]:
+        return dict(self._changes)
+
+    # ------------------------------------------------------------------ #
+    # planning
+    # ------------------------------------------------------------------ #
+
+    def remap(self, path: Path) -> Optional[RenameOp]:
+        """Return the RenameOp for a single file, or None if it is unaffected."""
+        parsed = self._old.parse(path, self._file_templates)
+        if parsed is None:
+            return None
+        name, tokens = parsed
+        if name not in self._migrated:
+            return None
+        defaults = self._old_defaults[name]
+        tokens = {k: v for k, v in tokens.items() if defaults.get(k) != v}
+        try:
+            new_path = self._new.generate(name, tokens, os_name=None).as_posix()
+        except (KeyError, ValueError) as e:
+            return RenameOp(path, None, name, 'error', str(e))
+        # generate() turns l/r eyes into printf placeholders; put the real eye back
+        eye = tokens.get('eye')
+        if eye in _EYE_PLACEHOLDERS:
+            new_path = new_path.replace(_EYE_PLACEHOLDERS[eye], eye)
+        dst = Path(new_path)
+        if dst == path:
+            return None
+        return RenameOp(path, dst, name)
+
+    def _scan(self, directory: Path) -> Tuple[List[Path], List[RenameOp], int]:
+        subdirs: List[Path] = []
+        ops: List[RenameOp] = []
+        files = 0
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(Path(entry.path))
+                    continue
+                files += 1
+                op = self.remap(Path(entry.path))
+                if op is not None:
+                    ops.append(op)
+        return subdirs, ops, files
+
+    def plan(self,
+             roots: Iterable[Path],
+             max_workers: Optional[int] = None,
+             progress: Optional[ProgressCallback] = None) -> Iterator[RenameOp]:
+        """
+        Crawl `roots` in parallel (one task per directory) and stream RenameOps.
+
+        Destinations that already exist on disk, or that two sources map to,
+        are yielded with status 'collision'.
+        """
+        start = time.perf_counter()
+        seen = 0
+        claimed: Dict[Path, Path] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = {pool.submit(self._scan, Path(root)) for root in roots}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, ops, files = future.result()
+                    pending.update(pool.submit(self._scan, d) for d in subdirs)
+                    seen += files
+                    for op in ops:
+                        yield self._check_collision(op, claimed)
+                if progress:
+                    progress(seen, time.perf_counter() - start)
+
+    @staticmethod
+    def _check_collision(op: RenameOp, claimed: Dict[Path, Path]) -> RenameOp:
+        if op.status != 'rename':
+            return op
+        other = claimed.setdefault(op.dst, op.src)
+        if other != op.src:
+            return RenameOp(op.src, op.dst, op.template, 'collision', f"also targeted by {other}")
+        if os.path.lexists(op.dst):
+            return RenameOp(op.src, op.dst, op.template, 'collision', "destination exists")
+        return op
+
+    # ------------------------------------------------------------------ #
+    # execution
+    # ------------------------------------------------------------------ #
+
+    def execute(self,
+                ops: Iterable[RenameOp],
+                max_workers: Optional[int] = None,
+                progress: Optional[ProgressCallback] = None) -> MigrationReport:
+        """
+        Apply every 'rename' op. Destination directories are created with
+        `make_dirs`. On the first failure, or on any other exception such
+        as KeyboardInterrupt, every completed rename is undone (and the
+        directories created for them removed) before the error is
+        re-raised. If the rollback itself fails, MigrationRollbackError is
+        raised from the original error.
+        """
+        todo = [op for op in ops if op.status == 'rename']
+        start = time.perf_counter()
+
+        created_dirs = make_dirs({op.dst.parent for op in todo}, max_workers=max_workers)
+        futures: Dict = {}
+        done = 0
+        try:
+            error: Optional[BaseException] = None
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                try:
+                    for op in todo:
+                        futures[pool.submit(self._rename, op)] = op
+                    for future in futures:
+                        if future.cancelled():
+                            continue
+                        if future.exception() is not None:
+                            error = error or future.exception()
+                            for f in futures:
+                                f.cancel()
+                            continue
+                        done += 1
+                        if progress and done % 1000 == 0:
+                            progress(done, time.perf_counter() - start)
+                except BaseException:
+                    for f in futures:
+                        f.cancel()
+                    raise
+            if error is not None:
+                raise error
+        except BaseException as e:
+            # the pool has shut down: every future is either done or cancelled
+            completed = [op for f, op in futures.items()
+                         if not f.cancelled() and f.exception() is None]
+            failures = self._rollback(completed, created_dirs)
+            if failures:
+                raise MigrationRollbackError(failures) from e
+            raise
+
+        elapsed = time.perf_counter() - start
+        if progress:
+            progress(done, elapsed)
+        return MigrationReport(done, elapsed)
+
+    @staticmethod
+    def _rename(op: RenameOp) -> None:
+        if os.path.lexists(op.dst):
+            raise FileExistsError(f"Destination appeared during migration: {op.dst}")
+        os.rename(op.src, op.dst)
+
+    @staticmethod
+    def _rollback(completed: List[RenameOp],
+                  created_dirs: List[Path]) -> List[Tuple[RenameOp, OSError]]:
+        """Undo `completed` renames; return the ones that could not be undone."""
+        failures = []
+        for op in completed:
+            try:
+                os.rename(op.dst, op.src)
+            except OSError as e:
+                failures.append((op, e))
+        remove_dirs(created_dirs)
+        return failures
@@ -0,0 +1,114 @@
+# pathmanager/parser.py
+
+import re
+from string import Formatter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class TemplateParser:
+    """
+    Reverse of PathManager.generate: match a filled path back to a template
+    and recover its token values.
+
+    Each pattern is compiled into an anchored regex. Optional tokens that
+    have no default may be empty, in which case PatternFormatter's clean-up
+    removed the separator next to them; the regex makes that separator
+    optional along with the token. Values are returned as they appear in
+    the path (transforms are not reversed).
+
+    Example
+    -------
+    >>> parser = TemplateParser({"t": {"pattern": "{root}/{shot}_{task}.{ext}"}})
+    >>> parser.parse("/show/SH010_comp.exr")
+    ('t', {'root': '/show', 'shot': 'SH010', 'task': 'comp', 'ext': 'exr'})
+    """
+
+    def __init__(self, templates: Dict[str, dict], names: Optional[Iterable[str]] = None):
+        names = list(templates) if names is None else list(names)
+        self._regexes: Dict[str, re.Pattern] = {
+            name: self._compile(templates[name]) for name in names
+        }
+        self._defaults: Dict[str, dict] = {
+            name: dict(templates[name].get('default_tokens', {}) or {}) for name in names
+        }
+        # Most literal characters first: specific templates win over generic ones
+        self._order: List[str] = sorted(
+            names, key=lambda n: -self._literal_length(templates[n]['pattern'])
+        )
+
+    @staticmethod
+    def _literal_length(pattern: str) -> int:
+        return sum(len(literal) for literal, *_ in Formatter().parse(pattern))
+
+    @staticmethod
+    def _compile(tpl: dict) -> re.Pattern:
+        pattern = tpl['pattern'].rstrip('/')
+        defaults = tpl.get('default_tokens', {}) or {}
+        optional = {t for t in tpl.get('optional_tokens', []) or [] if t not in defaults}
+
+        parts = list(Formatter().parse(pattern))
+        out: List[str] = []
+        seen = set()
+        pending = ''   # literal text not yet emitted
+        for i, (literal, field, _, _) in enumerate(parts):
+            pending += literal
+            if field is None:
+                continue
+            nxt = parts[i + 1][0] if i + 1 < len(parts) else ''
+            if field in seen:
+                out.append(re.escape(pending))
+                # back-reference only if the first occurrence matched
+                out.append(f'(?({field})(?P={field})|)')
+                pending = ''
+                continue
+            seen.add(field)
+            # a leading token (the root) may span several directories
+            group = f'(?P<{field}>.+?)' if i == 0 and not pending else f'(?P<{field}>[^/]+?)'
+            if field not in optional:
+                out.append(re.escape(pending) + group)
+                pending = ''
+                continue
+
+            # An empty optional token only loses a neighbouring separator
+            # when the clean-up rules (__, /_, _/, //, edge _) remove it.
+            at_end = i + 1 == len(parts) or (not nxt and parts[i + 1][1] is None)
+            before = pending[-1:] or ('^' if not out else '')
+            after = nxt[:1] or ('$' if at_end else '')
+            if before == '_' and after in ('_', '/', '$'):
+                out.append(re.escape(pending[:-1]) + f'(?:_{group})?')
+            elif (before in ('/', '^') and after == '_') or (before == '/' and after == '/'):
+                out.append(re.escape(pending) + f'(?:{group}{re.escape(after)})?')
+                # the separator was consumed together with the token
+                parts[i + 1] = (nxt[1:],) + tuple(parts[i + 1][1:])
+            else:
+                out.append(re.escape(pending) + f'(?P<{field}>[^/]*?)')
+            pending = ''
+        out.append(re.escape(pending))
+        return re.compile(''.join(out) + '/?$')
+
+    def match(self, name: str, path: str) -> Optional[Dict[str, str]]:
+        """Return the tokens of `path` for template `name`, or None."""
+        m = self._regexes[name].match(path)
+        if m is None:
+            return None
+        return {k: v for k, v in m.groupdict().items() if v is not None}
+
+    def parse(self, path: str, names: Optional[Iterable[str]] = None
+              ) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Return (template name, tokens) of the first template matching `path`."""
+        if names is None:
+            candidates = self._order
+        else:
+            wanted = set(names)
+            candidates = [n for n in self._order if n in wanted]
+        best = None
+        for name in candidates:
+            tokens = self.match(name, path)
+            if tokens is None:
+                continue
+            # Templates that differ only by token names (work_dir vs pub_dir)
+            # are told apart by how many of their default tokens match.
+            score = sum(tokens.get(k) == str(v) for k, v in self._defaults[name].items())
+            if best is None or score > best[0]:
+                best = (score, name, tokens)
+        return best and (best[1], best[2])
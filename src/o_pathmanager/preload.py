@@ -0,0 +1,127 @@
+# pathmanager/preload.py
+
+import gc
+import json
+import sys
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .factory import PathManagerFactory
+from .manager import PathManager
+
+# Managers built by `preload`; forked workers inherit this dict as-is.
+_PRELOADED: Dict[str, PathManager] = {}
+
+_HEADER = 8  # index length, little-endian
+
+
+def preload(studio_cfg: Path,
+            projects_root: Path,
+            shows: Iterable[str],
+            default_os=None,
+            freeze: bool = True) -> Dict[str, PathManager]:
+    """
+    Build one PathManager per show in the parent process, before forking.
+
+    Templates are already frozen into read-only mappings by PathManager,
+    so workers only ever read them. With `freeze` the heap is moved to the
+    permanent GC generation (``gc.freeze``): the collector in each worker
+    then never writes to those objects and their pages stay shared with
+    the parent after fork instead of being copied one by one.
+    """
+    for show in shows:
+        _PRELOADED[show] = PathManagerFactory.create_for_show(
+            studio_cfg, projects_root, show, default_os
+        )
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return dict(_PRELOADED)
+
+
+def get_manager(show: str) -> PathManager:
+    """Return the manager `preload` built for `show` in this (or the parent) process."""
+    try:
+        return _PRELOADED[show]
+    except KeyError:
+        raise KeyError(f"No preloaded PathManager for show '{show}'") from None
+
+
+class SharedTemplateStore:
+    """
+    Merged templates for several shows in one `multiprocessing.shared_memory` block.
+
+    For spawn-based pools, where nothing is inherited: the parent writes
+    the merged templates once and passes `name` to the workers, which
+    build their managers with `PathManager.from_templates` without
+    importing yaml or reading any config file.
+
+    The block holds a small JSON index (show -> offset, length) followed
+    by one JSON document per show. Attaching decodes only the index and
+    `manager` decodes a single show on each call, so a worker holds just
+    the templates of the managers it builds. Those are still private to
+    the worker: this saves start-up time, not template memory.
+
+    Example
+    -------
+    >>> store = SharedTemplateStore.create(preload(studio, root, ["VEL"]))
+    >>> pool = ctx.Pool(initializer=init, initargs=(store.name,))
+    >>> # in the worker
+    >>> pm = SharedTemplateStore.attach(name).manager("VEL")
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        size = int.from_bytes(shm.buf[:_HEADER], 'little')
+        self._index: Dict[str, List[int]] = json.loads(bytes(shm.buf[_HEADER:_HEADER + size]))
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def create(cls, managers: Dict[str, PathManager], name: Optional[str] = None) -> 'SharedTemplateStore':
+        docs = {
+            show: json.dumps(pm.get_templates(), separators=(',', ':')).encode('utf-8')
+            for show, pm in managers.items()
+        }
+        # offsets are relative to the end of the index
+        index, offset = {}, 0
+        for show, doc in docs.items():
+            index[show] = [offset, len(doc)]
+            offset += len(doc)
+        header = json.dumps(index, separators=(',', ':')).encode('utf-8')
+        payload = header + b''.join(docs.values())
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER + len(payload))
+        shm.buf[:_HEADER] = len(header).to_bytes(_HEADER, 'little')
+        shm.buf[_HEADER:_HEADER + len(payload)] = payload
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedTemplateStore':
+        # Pool workers share the parent's resource tracker, so attaching
+        # before 3.13 (where tracking can't be disabled) is harmless.
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    def shows(self) -> List[str]:
+        return list(self._index)
+
+    def manager(self, show: str, default_os=None) -> PathManager:
+        if show not in self._index:
+            raise KeyError(f"No templates for show '{show}' in shared store '{self.name}'")
+        offset, length = self._index[show]
+        start = _HEADER + int.from_bytes(self._shm.buf[:_HEADER], 'little') + offset
+        templates = json.loads(bytes(self._shm.buf[start:start + length]))
+        return PathManager.from_templates(templates, default_os)
+
+    def close(self) -> None:
+        """Detach; the creating process also removes the block."""
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,152 @@
+# pathmanager/probe.py
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+PathLike = Union[str, os.PathLike]
+
+
+class ProbeMeter:
+    """Real filesystem calls made by one thread inside a `metered` block."""
+
+    def __init__(self):
+        self.syscalls = 0
+
+
+class ProbeStrategy(ABC):
+    """Answers "does this path exist?" for the config lookups."""
+
+    @abstractmethod
+    def exists(self, path: PathLike) -> bool:
+        pass
+
+    def exists_many(self, paths: Iterable[PathLike]) -> List[bool]:
+        """Probe several paths at once; results are in input order."""
+        return [self.exists(p) for p in paths]
+
+    @property
+    def syscalls(self) -> int:
+        """Number of real filesystem calls made so far (0 if not tracked)."""
+        return 0
+
+    @contextmanager
+    def metered(self) -> Iterator[ProbeMeter]:
+        """Count the real calls this thread makes inside the block (0 if not tracked)."""
+        yield ProbeMeter()
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Forget what is known about `path` (or everything); no-op if nothing is cached."""
+        pass
+
+
+class CachingFileProbe(ProbeStrategy):
+    """
+    Existence probe with positive and negative caching.
+
+    On network filesystems a stat costs milliseconds and a failed lookup
+    can cost far more, while config paths are probed over and over while
+    a manager is built. Results are cached per path for `positive_ttl`
+    seconds (found) or `negative_ttl` seconds (missing); `exists_many`
+    issues the uncached probes concurrently. Call `invalidate` after
+    creating or removing a probed file.
+    """
+
+    def __init__(self,
+                 positive_ttl: float = 30.0,
+                 negative_ttl: float = 2.0,
+                 max_workers: int = 8,
+                 clock: Callable[[], float] = time.monotonic):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._max_workers = max_workers
+        self._clock       = clock
+        self._cache: Dict[str, Tuple[bool, float]] = {}
+        self._lock        = threading.Lock()
+        self._syscalls    = 0
+        self._hits        = 0
+        self._local       = threading.local()
+
+    @property
+    def syscalls(self) -> int:
+        return self._syscalls
+
+    def stats(self) -> Dict[str, int]:
+        return {'syscalls': self._syscalls, 'hits': self._hits, 'cached': len(self._cache)}
+
+    @contextmanager
+    def metered(self) -> Iterator[ProbeMeter]:
+        # per thread, so concurrent builds sharing a probe don't count each
+        # other's stats; nested blocks all see the inner block's calls
+        meter = ProbeMeter()
+        meters = self._local.__dict__.setdefault('meters', [])
+        meters.append(meter)
+        try:
+            yield meter
+        finally:
+            meters.remove(meter)
+
+    def _charge(self, count: int) -> None:
+        for meter in getattr(self._local, 'meters', ()):
+            meter.syscalls += count
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Drop one cached entry, or the whole cache when `path` is None."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.fspath(path), None)
+
+    def _lookup(self, key: str) -> Optional[bool]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            found, expires = entry
+            if self._clock() >= expires:
+                del self._cache[key]
+                return None
+            self._hits += 1
+            return found
+
+    def _stat(self, key: str) -> bool:
+        try:
+            os.stat(key)
+            found = True
+        except (OSError, ValueError):
+            found = False
+        ttl = self.positive_ttl if found else self.negative_ttl
+        with self._lock:
+            self._syscalls += 1
+            if ttl > 0:
+                self._cache[key] = (found, self._clock() + ttl)
+        return found
+
+    def exists(self, path: PathLike) -> bool:
+        key = os.fspath(path)
+        found = self._lookup(key)
+        if found is not None:
+            return found
+        self._charge(1)
+        return self._stat(key)
+
+    def exists_many(self, paths: Iterable[PathLike]) -> List[bool]:
+        keys = [os.fspath(p) for p in paths]
+        results = [self._lookup(k) for k in keys]
+        misses = list(dict.fromkeys(k for k, r in zip(keys, results) if r is None))
+        self._charge(len(misses))
+        if len(misses) > 1:
+            with ThreadPoolExecutor(max_workers=min(self._max_workers, len(misses))) as pool:
+                probed = dict(zip(misses, pool.map(self._stat, misses)))
+        else:
+            probed = {k: self._stat(k) for k in misses}
+        return [probed[k] if r is None else r for k, r in zip(keys, results)]
+
+
+# Shared by config, factory, loader and manager unless a probe is passed in.
+default_probe = CachingFileProbe()
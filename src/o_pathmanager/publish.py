@@ -0,0 +1,210 @@
+# pathmanager/publish.py
+
+import errno
+import os
+import re
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MODES = ('copy', 'hardlink', 'reflink')
+
+_FICLONE = 0x40049409                           # linux/fs.h
+_FRAME_PLACEHOLDER = re.compile(r'%0?(\d*)d')  # "%04d" left in by padding tokens
+_SOURCE_FRAME = re.compile(r'(\d+)(?=\.[^./]+$|$)')
+_EYE_PLACEHOLDERS = {'%v': ('l', 'r'), '%V': ('left', 'right')}
+_CHUNK = 1 << 30
+# errors meaning "this kernel/filesystem cannot do that", not a real I/O failure
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL,
+                getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP), errno.ENOTTY}
+
+
+@dataclass
+class PublishReport:
+    destinations: List[Path] = field(default_factory=list)
+    written: int = 0
+    skipped: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+def destinations(filled: str, sources: List[Path], tokens: dict) -> List[Path]:
+    """
+    Map every source onto the generated path `filled`.
+
+    A frame placeholder ("%04d") is replaced by the frame number taken from
+    each source's file name; a stereo placeholder ("%v"/"%V") by the
+    `eye` token, which must already be transformed ('l', 'left', ...). Without a frame placeholder exactly one source
+    is expected.
+    """
+    for placeholder, eyes in _EYE_PLACEHOLDERS.items():
+        if placeholder in filled:
+            eye = tokens.get('eye')
+            if eye not in eyes:
+                raise ValueError(f"Cannot resolve '{placeholder}' from eye '{eye}'")
+            filled = filled.replace(placeholder, eye)
+
+    frame = _FRAME_PLACEHOLDER.search(filled)
+    if frame is None:
+        if len(sources) != 1:
+            raise ValueError(f"'{filled}' is a single file but {len(sources)} sources were given")
+        return [Path(filled)]
+
+    width = int(frame.group(1) or 0)
+    out = []
+    for src in sources:
+        m = _SOURCE_FRAME.search(src.name)
+        if m is None:
+            raise ValueError(f"No frame number in source '{src}'")
+        number = f"{int(m.group(1)):0{width}d}"
+        out.append(Path(filled[:frame.start()] + number + filled[frame.end():]))
+    return out
+
+
+class Publisher:
+    """
+    Copy or link many sources into template-generated destinations.
+
+    Destination directories are created once up front and files are
+    transferred by a bounded thread pool. Copies stay in the kernel
+    (``copy_file_range``, then ``sendfile``), reflinks use ``FICLONE``
+    and fall back to a copy. Every file is written under a temporary name
+    and renamed into place, and files whose size and mtime already match
+    the source are skipped.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._max_workers = max_workers
+
+    def publish(self,
+                pairs: Iterable[Tuple[Path, Path]],
+                mode: str = 'copy') -> PublishReport:
+        if mode not in MODES:
+            raise ValueError(f"Unknown publish mode '{mode}'; expected one of {MODES}")
+        pairs = list(pairs)
+        report = PublishReport(destinations=[dst for _, dst in pairs])
+        start = time.perf_counter()
+
+        for directory in {dst.parent for _, dst in pairs}:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        transfer = getattr(self, f'_{mode}')
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            for written in pool.map(lambda p: transfer(*p), pairs):
+                if written is None:
+                    report.skipped += 1
+                else:
+                    report.written += 1
+                    report.bytes += written
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    # ------------------------------------------------------------------ #
+    # transfers; each returns bytes written, or None when skipped
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _unchanged(src_stat: os.stat_result, dst: Path) -> bool:
+        try:
+            dst_stat = os.stat(dst)
+        except FileNotFoundError:
+            return False
+        return (dst_stat.st_size == src_stat.st_size
+                and dst_stat.st_mtime_ns == src_stat.st_mtime_ns)
+
+    @staticmethod
+    def _temp_name(dst: Path) -> Path:
+        return dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+    def _copy(self, src: Path, dst: Path, reflink: bool = False) -> Union[int, None]:
+        src_stat = os.stat(src)
+        if self._unchanged(src_stat, dst):
+            return None
+        tmp = self._temp_name(dst)
+        try:
+            with open(src, 'rb') as fsrc, open(tmp, 'wb') as fdst:
+                if not (reflink and self._clone(fsrc.fileno(), fdst.fileno())):
+                    self._copy_data(fsrc, fdst, src_stat.st_size)
+            shutil.copymode(src, tmp)
+            os.utime(tmp, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+            os.replace(tmp, dst)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return src_stat.st_size
+
+    def _reflink(self, src: Path, dst: Path) -> Union[int, None]:
+        return self._copy(src, dst, reflink=True)
+
+    def _hardlink(self, src: Path, dst: Path) -> Union[int, None]:
+        try:
+            if os.path.samefile(src, dst):
+                return None
+        except FileNotFoundError:
+            pass
+        tmp = self._temp_name(dst)
+        os.link(src, tmp)
+        try:
+            os.replace(tmp, dst)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return 0
+
+    @staticmethod
+    def _clone(src_fd: int, dst_fd: int) -> bool:
+        if fcntl is None:
+            return False
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        except OSError as e:
+            if e.errno in _UNSUPPORTED:
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def _copy_data(fsrc, fdst, size: int) -> None:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        offset = 0
+        for name in ('copy_file_range', 'sendfile'):
+            fn = getattr(os, name, None)
+            if fn is None:
+                continue
+            try:
+                while offset < size:
+                    if name == 'copy_file_range':
+                        n = fn(src_fd, dst_fd, min(_CHUNK, size - offset))
+                    else:
+                        n = fn(dst_fd, src_fd, offset, min(_CHUNK, size - offset))
+                    if n == 0:
+                        break
+                    offset += n
+            except OSError as e:
+                # only fall back if nothing was written yet
+                if e.errno not in _UNSUPPORTED or offset:
+                    raise
+                continue
+            if offset == size:
+                return
+            if offset:
+                # the source shrank, or the kernel stopped early
+                raise OSError(errno.EIO, f"Short copy: {offset} of {size} bytes", fsrc.name)
+            # some filesystems report 0 bytes instead of an error; try the next method
+        shutil.copyfileobj(fsrc, fdst)
+        if fdst.tell() != size:
+            raise OSError(errno.EIO, f"Short copy: {fdst.tell()} of {size} bytes", fsrc.name)
@@ -42,7 +42,8 @@ class StringTransformerStrategy(TransformStrategy):
     def apply(self,
               transforms: Dict[str, List[str]],
               tokens: Dict[str, str]) -> Dict[str, str]:
-
+        """Return a transformed copy of `tokens`; the input is left untouched."""
+        tokens = dict(tokens)
         for field, funcs in transforms.items():
             # skip if token missing or explicitly None
             if field not in tokens or tokens[field] is None:
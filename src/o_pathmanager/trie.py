@@ -0,0 +1,77 @@
+# pathmanager/trie.py
+
+from string import Formatter
+from typing import Dict, List, Set
+
+
+def _fields(text: str) -> List[str]:
+    return [f for _, f, _, _ in Formatter().parse(text) if f is not None]
+
+
+class _Node:
+    """One pattern segment (the text between two '/')."""
+    __slots__ = ('segment', 'children', 'literal', 'vanishes', 'terminals')
+
+    def __init__(self, segment: str):
+        self.segment   = segment
+        self.children: Dict[str, '_Node'] = {}
+        self.literal   = not _fields(segment)
+        self.vanishes  = False   # segment is a lone optional token that may be empty
+        self.terminals: Set[str] = set()
+
+
+class TemplateTrie:
+    """
+    Template patterns compiled into a trie of path segments.
+
+    Nearly every template starts with the same directories
+    (``{root}/seq/{seq}/{shotCode}/{task}/``), so the patterns share most
+    of their nodes. `candidates` walks the trie comparing literal segments
+    to narrow reverse matching down before any regex runs.
+    """
+
+    def __init__(self, templates: Dict[str, dict]):
+        self._root = _Node('')
+        for name, tpl in templates.items():
+            defaults = tpl.get('default_tokens', {}) or {}
+            optional = {t for t in tpl.get('optional_tokens', []) or [] if t not in defaults}
+
+            node = self._root
+            for segment in tpl['pattern'].rstrip('/').split('/'):
+                node = node.children.setdefault(segment, _Node(segment))
+                if segment.startswith('{') and segment.endswith('}') and segment[1:-1] in optional:
+                    node.vanishes = True
+            node.terminals.add(name)
+
+    # ------------------------------------------------------------------ #
+    # reverse matching
+    # ------------------------------------------------------------------ #
+
+    def candidates(self, path: str) -> List[str]:
+        """Templates whose literal segments are compatible with `path`."""
+        segments = path.rstrip('/').split('/')
+        found: Dict[str, None] = {}
+        self._walk(self._root, segments, 0, found, top=True)
+        return list(found)
+
+    def _walk(self, node: _Node, segments: List[str], i: int,
+              found: Dict[str, None], top: bool = False) -> None:
+        n = len(segments)
+        if i == n:
+            found.update(dict.fromkeys(node.terminals))
+        if i < n:
+            child = node.children.get(segments[i])
+            if child is not None and child.literal:
+                self._walk(child, segments, i + 1, found)
+        for child in node.children.values():
+            if child.literal:
+                continue
+            if top:
+                # a leading token (the root) may span several directories
+                for j in range(i + 1, n + 1):
+                    self._walk(child, segments, j, found)
+                continue
+            if i < n:
+                self._walk(child, segments, i + 1, found)
+            if child.vanishes:
+                self._walk(child, segments, i, found)
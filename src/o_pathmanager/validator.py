@@ -2,7 +2,7 @@
 
 import re
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Mapping, Optional, Sequence
 
 class ValidationStrategy(ABC):
     @abstractmethod
@@ -10,48 +10,177 @@ class ValidationStrategy(ABC):
         """Validate tokens against template constraints."""
         pass
 
+    def prepare(self, templates: Dict[str, dict]) -> None:
+        """Hook called once with the merged templates; compile rules here."""
+        pass
+
+    def validate_batch(self,
+                       template_name: str,
+                       columns: Mapping[str, Sequence[str]],
+                       tpl_conf: dict) -> None:
+        """Validate a column-oriented batch of token sets (token -> values)."""
+        keys = list(columns)
+        for row in zip(*(columns[k] for k in keys)):
+            self.validate(template_name, dict(zip(keys, row)), tpl_conf)
+
+
+class _TokenRule:
+    """Precompiled constraints for a single token."""
+    __slots__ = ('token', 'enum', 'regex', 'min_length', 'max_length',
+                 'required_when', 'forbidden_unless')
+
+    def __init__(self, token: str, conf: dict):
+        self.token      = token
+        enum            = conf.get('enum')
+        self.enum       = frozenset(enum) if enum is not None else None
+        regex           = conf.get('regex')
+        self.regex      = re.compile(regex) if regex else None
+        self.min_length = conf.get('min_length')
+        self.max_length = conf.get('max_length')
+        # conditional rules: {other_token: [values]}, compared case-insensitively
+        self.required_when    = self._compile_condition(conf.get('required_when'))
+        self.forbidden_unless = self._compile_condition(conf.get('forbidden_unless'))
+
+    @staticmethod
+    def _compile_condition(cond: Optional[dict]):
+        if not cond:
+            return None
+        return tuple((k, frozenset(str(v).lower() for v in vals)) for k, vals in cond.items())
+
+    @staticmethod
+    def _holds(cond, tokens: Mapping[str, str]) -> bool:
+        return all(str(tokens.get(k) or '').lower() in vals for k, vals in cond)
+
+    def check_value(self, template_name: str, value: str) -> None:
+        if self.enum is not None and value not in self.enum:
+            raise ValueError(f"Invalid {self.token} '{value}' for template '{template_name}'")
+        if self.regex is not None and not self.regex.match(value):
+            raise ValueError(f"Invalid {self.token} '{value}' for template '{template_name}'")
+        if self.min_length is not None and len(value) < self.min_length:
+            raise ValueError(
+                f"{self.token} '{value}' is shorter than {self.min_length} for template '{template_name}'"
+            )
+        if self.max_length is not None and len(value) > self.max_length:
+            raise ValueError(
+                f"{self.token} '{value}' is longer than {self.max_length} for template '{template_name}'"
+            )
+
+    def check_conditions(self, template_name: str, tokens: Mapping[str, str]) -> None:
+        value = tokens.get(self.token)
+        if self.required_when and not value and self._holds(self.required_when, tokens):
+            raise ValueError(
+                f"Template '{template_name}' requires a {self.token} token when "
+                f"{self._describe(self.required_when, tokens)}"
+            )
+        if self.forbidden_unless and value and not self._holds(self.forbidden_unless, tokens):
+            raise ValueError(
+                f"Template '{template_name}' does not allow {self.token} '{value}' when "
+                f"{self._describe(self.forbidden_unless, tokens)}"
+            )
+
+    @staticmethod
+    def _describe(cond, tokens: Mapping[str, str]) -> str:
+        return ", ".join(f"{k}='{tokens.get(k) or ''}' (rule: {k} in {sorted(vals)})"
+                         for k, vals in cond)
+
+    @property
+    def conditional(self) -> bool:
+        return bool(self.required_when or self.forbidden_unless)
+
+
 class TokenValidatorStrategy(ValidationStrategy):
-    #__DESCRIPTOR_ALLOWED = {'temp', 'review', 'delivery', 'final', 'precomp'}
-    #__REP_TOKEN_PATTERN   = re.compile(r'^[a-z0-9]+_[a-z0-9]+_[a-z0-9]+$')
-    #__LAYERID_TOKEN_PATTERN = re.compile(r'^[A-Za-z]$')
+    """
+    Declarative token validation.
+
+    Rules are declared in the template's own ``validation`` section and
+    merged over ``DEFAULT_RULES`` (empty unless a studio passes its own;
+    a rule set to ``null`` disables a default)::
+
+        validation:
+          descriptor: {enum: [temp, final]}
+          rep:        {regex: '^[a-z0-9]+_[a-z0-9]+$', max_length: 32}
+          padding:    {required_when: {ext: [exr, dpx]}}
+
+    The legacy ``allowed_eyes`` and ``sequence_exts`` keys are translated
+    into the same rules. Everything is compiled once per template into
+    frozensets and precompiled regexes; ``prepare`` does this up front
+    for all templates so ``validate`` is a single closure call.
+    """
+
+    DEFAULT_RULES: Dict[str, dict] = {}
+
+    def __init__(self, default_rules: Optional[Dict[str, dict]] = None):
+        self._default_rules = self.DEFAULT_RULES if default_rules is None else default_rules
+        self._compiled: Dict[str, tuple] = {}
+
+    def prepare(self, templates: Dict[str, dict]) -> None:
+        self._compiled = {name: self._compile(name, conf) for name, conf in templates.items()}
 
     def validate(self, template_name: str, tokens: Dict[str, str], tpl_conf: dict) -> None:
-        # 1) rep token
-        #rep = tokens.get('rep')
-        #if rep and not self.__REP_TOKEN_PATTERN.match(rep):
-        #    raise ValueError(f"Invalid rep '{rep}' for template '{template_name}'")
-
-        # 2) descriptor token
-        #descriptor = tokens.get('descriptor')
-        #if descriptor and descriptor not in self.__DESCRIPTOR_ALLOWED:
-        #    raise ValueError(f"Invalid descriptor '{descriptor}' for template '{template_name}'")
-
-        # 3) layerID token
-        #layerID = tokens.get('layerID')
-        #if layerID is not None and not self.__LAYERID_TOKEN_PATTERN.match(layerID):
-        #    raise ValueError(
-        #        f"Invalid layerID '{layerID}' for template '{template_name}'. Must be a single letter."
-        #    )
-
-        # 4) eye token against allowed_eyes
-        allowed_eyes = tpl_conf.get('allowed_eyes', [])
-        eye = tokens.get('eye')
-        if allowed_eyes and eye and eye not in allowed_eyes:
-            raise ValueError(f"Eye '{eye}' not allowed for template '{template_name}'")
-        
-        # 5) sequence vs single‐file enforcement
-        #ext      = tokens.get('ext', '').lower()
-        #padding  = tokens.get('padding', '')
-        #seq_exts = tpl_conf.get('sequence_exts', [])
-
-        #if seq_exts:
-        #    # If it's one of the “is a sequence” extensions, padding is mandatory
-        #    if ext in seq_exts and not padding:
-        #        raise ValueError(
-        #            f"Template '{template_name}' requires a padding token when ext='{ext}'"
-        #        )
-        #    # If it’s not in that list, padding must be empty
-        #    if ext not in seq_exts and padding:
-        #        raise ValueError(
-        #            f"Template '{template_name}' should not have padding when ext='{ext}'"
-        #        )
+        compiled = self._compiled.get(template_name) or self._compile(template_name, tpl_conf)
+        compiled[1](tokens)
+
+    def validate_batch(self,
+                       template_name: str,
+                       columns: Mapping[str, Sequence[str]],
+                       tpl_conf: dict) -> None:
+        rules, _ = self._compiled.get(template_name) or self._compile(template_name, tpl_conf)
+
+        # value rules only need to see each distinct value once per column
+        for rule in rules:
+            column = columns.get(rule.token)
+            if column is None:
+                continue
+            for value in set(column):
+                if value:
+                    rule.check_value(template_name, str(value))
+
+        conditional = [rule for rule in rules if rule.conditional]
+        if conditional:
+            keys = list(columns)
+            for row in zip(*(columns[k] for k in keys)):
+                tokens = dict(zip(keys, row))
+                for rule in conditional:
+                    rule.check_conditions(template_name, tokens)
+
+    # ------------------------------------------------------------------ #
+    # compilation
+    # ------------------------------------------------------------------ #
+
+    def _rule_confs(self, tpl_conf: dict) -> Dict[str, dict]:
+        confs = {k: dict(v) for k, v in self._default_rules.items()}
+
+        allowed_eyes = tpl_conf.get('allowed_eyes')
+        if allowed_eyes:
+            confs['eye'] = {'enum': list(allowed_eyes)}
+
+        seq_exts = tpl_conf.get('sequence_exts')
+        if seq_exts:
+            # padding is mandatory for sequence extensions and forbidden otherwise
+            confs['padding'] = {
+                'required_when':    {'ext': list(seq_exts)},
+                'forbidden_unless': {'ext': list(seq_exts)},
+            }
+
+        for token, conf in (tpl_conf.get('validation') or {}).items():
+            if conf is None:
+                confs.pop(token, None)
+            else:
+                confs[token] = dict(conf)
+        return confs
+
+    def _compile(self, template_name: str, tpl_conf: dict) -> tuple:
+        rules: List[_TokenRule] = [
+            _TokenRule(token, conf) for token, conf in self._rule_confs(tpl_conf).items()
+        ]
+        conditional = [rule for rule in rules if rule.conditional]
+
+        def check(tokens: Mapping[str, str]) -> None:
+            for rule in rules:
+                value = tokens.get(rule.token)
+                if value:
+                    rule.check_value(template_name, str(value))
+            for rule in conditional:
+                rule.check_conditions(template_name, tokens)
+
+        return rules, check
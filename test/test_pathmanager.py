@@ -1,7 +1,10 @@
 # tests/test_pathmanager.py
 
+import json
 import os
+import shutil
 import tempfile
+import threading
 from pathlib import Path, PureWindowsPath, PurePosixPath
 
 import pytest
@@ -14,6 +17,18 @@ from o_pathmanager.transformer import StringTransformerStrategy
 from o_pathmanager.loader import YamlDeepMergeLoader
 from o_pathmanager.manager import PathManager
 from o_pathmanager.factory import PathManagerFactory
+from o_pathmanager.migration import MigrationPlanner, MigrationRollbackError, RenameOp, diff_templates
+from o_pathmanager.probe import CachingFileProbe
+from o_pathmanager.config import load_config
+from o_pathmanager.trie import TemplateTrie
+from o_pathmanager import preload as preload_mod
+from o_pathmanager.preload import SharedTemplateStore
+from o_pathmanager.manifest import ManifestReader, ManifestWriter, write_manifest
+
+STUDIO_CFG = Path(__file__).resolve().parents[1] / "src" / "o_pathmanager" / "config" / "default.yaml"
+SHOT_TOKENS = {"root": "/mnt/o/VEL", "seq": "TD", "shotCode": "td0010", "task": "comp",
+               "show": "vel", "descriptor": "final", "ext": "EXR", "version": 3,
+               "preset": "Slap", "sg_version_name": "TD0010_comp_v003", "padding": "%04d"}
 
 
 # -----------------------------------------------------------------------------
@@ -31,6 +46,17 @@ def test_pattern_formatter_missing_key_raises_keyerror():
     with pytest.raises(KeyError):
         fmt.format("{x}/{y}", {"x": "only"})
 
+@pytest.mark.parametrize("path", [
+    "/a/b/c.exr", "__a___b__", "/_a_/b_/_c", "_/a//b_", "a//_b__/c_", "", "_", "//",
+])
+def test_pattern_formatter_cleanup_fast_path(path):
+    fmt = PatternFormatter()
+    expected = path
+    for regex, repl in ((fmt._MULTI_UNDER, "_"), (fmt._UNDER_SLASH, "/"),
+                        (fmt._EDGE_UNDER, ""), (fmt._MULTI_SLASH, "/")):
+        expected = regex.sub(repl, expected)
+    assert fmt.cleanup(path) == expected
+
 
 # -----------------------------------------------------------------------------
 # OSPathFormatter
@@ -78,9 +104,17 @@ def test_string_transformer_unknown_transform():
 # TokenValidatorStrategy
 # -----------------------------------------------------------------------------
 
+# The checks these tests were written for; studios now declare them per
+# template under `validation:` or pass them as defaults like this.
+STUDIO_RULES = {
+    "descriptor": {"enum": ["temp", "review", "delivery", "final", "precomp"]},
+    "rep":        {"regex": r"^[a-z0-9]+_[a-z0-9]+_[a-z0-9]+$"},
+    "layerID":    {"regex": r"^[A-Za-z]$"},
+}
+
 @pytest.fixture
 def validator():
-    return TokenValidatorStrategy()
+    return TokenValidatorStrategy(default_rules=STUDIO_RULES)
 
 def test_validator_valid_tokens(validator):
     tokens = {"rep": "abc_123_def", "descriptor": "temp", "layerID": "Z", "eye": "left"}
@@ -148,6 +182,27 @@ def test_yaml_deep_merge_loader(tmp_path):
     assert "bar" in merged
     assert merged["bar"]["pattern"] == "{z}"
 
+def test_yaml_loader_raises_on_stale_probe(tmp_path):
+    studio = tmp_path / "studio.yaml"
+    write_yaml(studio, {"templates": {"foo": {"pattern": "{a}"}}})
+    probe = CachingFileProbe()
+    loader = YamlDeepMergeLoader(probe)
+    assert "foo" in loader.load([studio])
+
+    studio.unlink()       # still cached as found
+    with pytest.raises(FileNotFoundError):
+        loader.load([studio])
+    with pytest.raises(FileNotFoundError, match="Config path does not exist"):
+        loader.load([studio])
+
+def test_yaml_loader_skips_unparsable_file(tmp_path, capsys):
+    studio = tmp_path / "studio.yaml"
+    write_yaml(studio, {"templates": {"foo": {"pattern": "{a}"}}})
+    broken = tmp_path / "broken.yaml"
+    broken.write_text("templates: [unclosed", encoding="utf-8")
+    assert YamlDeepMergeLoader().load([studio, broken]) == {"foo": {"pattern": "{a}"}}
+    assert "Failed to parse YAML" in capsys.readouterr().out
+
 
 # -----------------------------------------------------------------------------
 # PathManager
@@ -203,7 +258,8 @@ def test_generate_invalid_validator(tmp_path):
             "bad": {
                 "pattern": "{rep}",
                 "required_tokens": ["rep"],
-                "transforms": {}
+                "transforms": {},
+                "validation": {"rep": {"regex": "^[a-z0-9]+_[a-z0-9]+_[a-z0-9]+$"}}
             }
         }
     })
@@ -229,3 +285,584 @@ def test_factory_create_for_show(tmp_path):
     write_yaml(override, {"templates": {}})
     pm = PathManagerFactory.create_for_show(studio, tmp_path / "ProjectRoot", "SHOW", default_os=None)
     assert isinstance(pm.get_templates(), dict)
+
+
+# -----------------------------------------------------------------------------
+# PathManager.materialize
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def dir_templates(tmp_path):
+    config = tmp_path / "dirs.yaml"
+    write_yaml(config, {
+        "templates": {
+            "work_dir": {
+                "pattern": "{root}/seq/{seq}/{shotCode}/{task}/work_dir/",
+                "required_tokens": ["root", "seq", "shotCode", "task"],
+                "transforms": {"shotCode": ["uppercase"]},
+            },
+            "pub_dir": {
+                "pattern": "{root}/seq/{seq}/{shotCode}/{task}/pub_dir/",
+                "required_tokens": ["root", "seq", "shotCode", "task"],
+            },
+            "work_file": {
+                "pattern": "{root}/{task}.{ext}",
+                "required_tokens": ["root", "task", "ext"],
+            },
+        }
+    })
+    return config
+
+def test_materialize_creates_deduplicated_tree(tmp_path, dir_templates):
+    pm = PathManager([dir_templates])
+    root = tmp_path / "show"
+    shots = [{"root": root.as_posix(), "seq": "SQ", "shotCode": f"sh{i:03d}", "task": "comp"}
+             for i in range(5)]
+    created = pm.materialize(["work_dir", "pub_dir"], shots + shots)
+
+    assert (root / "seq" / "SQ" / "sh004" / "comp" / "pub_dir").is_dir()
+    assert (root / "seq" / "SQ" / "SH000" / "comp" / "work_dir").is_dir()
+    assert len(created) == len(set(created))
+    assert created.index(root / "seq") < created.index(root / "seq" / "SQ")
+    # Second run finds everything in place
+    assert pm.materialize(["work_dir", "pub_dir"], shots) == []
+
+def test_materialize_dry_run(tmp_path, dir_templates):
+    pm = PathManager([dir_templates])
+    root = tmp_path / "show"
+    shots = [{"root": root.as_posix(), "seq": "SQ", "shotCode": "a", "task": "comp"}]
+    plan = pm.materialize(["work_dir"], shots, dry_run=True)
+    # only directories that do not exist yet, starting below tmp_path
+    assert plan[0] == root
+    assert plan[-1] == root / "seq" / "SQ" / "A" / "comp" / "work_dir"
+    assert not root.exists()
+    assert pm.materialize(["work_dir"], shots) == plan
+
+def test_materialize_sees_removed_directories(tmp_path, dir_templates):
+    pm = PathManager([dir_templates])
+    root = tmp_path / "show"
+    shots = [{"root": root.as_posix(), "seq": "SQ", "shotCode": "b", "task": "comp"}]
+    pm.materialize(["work_dir"], shots)
+    shutil.rmtree(root / "seq" / "SQ" / "B")
+    created = pm.materialize(["work_dir"], shots)
+    assert created[0] == root / "seq" / "SQ" / "B"
+    assert (root / "seq" / "SQ" / "B" / "comp" / "work_dir").is_dir()
+
+def test_materialize_rejects_file_template(dir_templates):
+    pm = PathManager([dir_templates])
+    with pytest.raises(ValueError):
+        pm.materialize(["work_file"], [])
+
+
+# -----------------------------------------------------------------------------
+# TokenValidatorStrategy: declarative rules
+# -----------------------------------------------------------------------------
+
+def test_validator_yaml_rules(validator):
+    tpl_conf = {"validation": {
+        "descriptor": {"enum": ["hero"]},
+        "task": {"regex": "^[a-z]+$", "max_length": 4},
+        "rep": None,
+    }}
+    validator.validate("t", {"descriptor": "hero", "task": "comp", "rep": "ANY"}, tpl_conf)
+    with pytest.raises(ValueError):
+        validator.validate("t", {"descriptor": "temp"}, tpl_conf)
+    with pytest.raises(ValueError):
+        validator.validate("t", {"task": "layout"}, tpl_conf)
+
+@pytest.mark.parametrize("tokens", [
+    {"ext": "EXR", "padding": ""},
+    {"ext": "mov", "padding": "%04d"},
+])
+def test_validator_sequence_exts(tokens, validator):
+    with pytest.raises(ValueError):
+        validator.validate("t", tokens, {"sequence_exts": ["exr", "dpx"]})
+
+def test_validator_batch_columns(validator):
+    tpl_conf = {"sequence_exts": ["exr"]}
+    validator.prepare({"seq": tpl_conf})
+    columns = {"descriptor": ["final", "temp", "final"],
+               "ext": ["exr", "exr", "mov"],
+               "padding": ["%04d", "%04d", ""]}
+    validator.validate_batch("seq", columns, tpl_conf)
+    columns["padding"][2] = "%04d"
+    with pytest.raises(ValueError):
+        validator.validate_batch("seq", columns, tpl_conf)
+
+def test_default_yaml_validation_is_per_template():
+    pm = PathManager([STUDIO_CFG])
+    # work files accept any descriptor, versions only the whitelisted ones
+    pm.generate("work_files", dict(SHOT_TOKENS, descriptor="wip"))
+    with pytest.raises(ValueError):
+        pm.generate("sg_version_name", dict(SHOT_TOKENS, descriptor="wip"))
+    pm.generate("sg_version_name", dict(SHOT_TOKENS, descriptor="FINAL", sg_version_rep="aces_4k_mov"))
+
+def test_default_yaml_sequence_padding():
+    pm = PathManager([STUDIO_CFG])
+    tokens = {k: v for k, v in SHOT_TOKENS.items() if k != "padding"}
+    assert "%04d" not in str(pm.generate("published_seq_files", dict(tokens, ext="mov")))
+    with pytest.raises(ValueError, match="requires a padding token when ext='exr'"):
+        pm.generate("published_seq_files", tokens)
+    with pytest.raises(ValueError, match="does not allow padding"):
+        pm.generate("published_seq_files", dict(tokens, ext="mov", padding="%04d"))
+
+
+# -----------------------------------------------------------------------------
+# PathManager thread safety
+# -----------------------------------------------------------------------------
+
+def test_generate_does_not_mutate_tokens(simple_templates):
+    pm = PathManager([simple_templates])
+    tokens = {"task": "foo"}
+    pm.generate("run", tokens)
+    assert tokens == {"task": "foo"}
+
+def test_generate_shared_across_threads(simple_templates):
+    from concurrent.futures import ThreadPoolExecutor
+
+    pm = PathManager([simple_templates])
+    tokens = {"task": "foo", "id": "7"}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = set(pool.map(lambda _: pm.generate("run", tokens), range(200)))
+    assert results == {Path("FOO/7.dat")}
+    assert tokens == {"task": "foo", "id": "7"}
+
+
+# -----------------------------------------------------------------------------
+# TemplateParser / MigrationPlanner
+# -----------------------------------------------------------------------------
+
+WORK_FILES = {
+    "pattern": "{root}/{shotCode}/{work_dir}/{shotCode}_{task}_{descriptor}_v{version}.{ext}",
+    "required_tokens": ["root", "shotCode", "task", "version", "ext"],
+    "optional_tokens": ["work_dir", "descriptor"],
+    "default_tokens": {"work_dir": "work"},
+    "transforms": {"version": ["version_format"]},
+}
+
+@pytest.fixture
+def migration_configs(tmp_path):
+    old = tmp_path / "old.yaml"
+    new = tmp_path / "new.yaml"
+    write_yaml(old, {"templates": {"work_files": WORK_FILES}})
+    renamed = dict(WORK_FILES, pattern="{root}/{shotCode}/{work_dir}/{task}_{shotCode}_{descriptor}_v{version}.{ext}")
+    write_yaml(new, {"templates": {"work_files": renamed}})
+    return old, new
+
+def test_parse_round_trip(migration_configs):
+    pm = PathManager([migration_configs[0]])
+    for tokens in ({"root": "/a/b", "shotCode": "SH1", "task": "comp", "version": 2, "ext": "nk"},
+                   {"root": "/a/b", "shotCode": "SH1", "task": "comp", "version": 2, "ext": "nk",
+                    "descriptor": "final"}):
+        path = pm.generate("work_files", tokens)
+        name, parsed = pm.parse(path)
+        assert name == "work_files"
+        assert pm.generate(name, parsed) == path
+    assert pm.parse("/a/b/unrelated.txt") is None
+
+def test_diff_templates():
+    assert diff_templates({"a": {"p": 1}, "b": {}}, {"a": {"p": 2}, "c": {}}) == {
+        "a": "changed", "b": "removed", "c": "added"}
+
+def test_migration_plan_and_execute(tmp_path, migration_configs):
+    old_pm = PathManager([migration_configs[0]])
+    root = tmp_path / "show"
+    sources = []
+    for shot in ("SH1", "SH2"):
+        for version in (1, 2):
+            p = Path(old_pm.generate("work_files", {"root": root.as_posix(), "shotCode": shot,
+                                                    "task": "comp", "version": version, "ext": "nk"}))
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text(p.name)
+            sources.append(p)
+    (root / "SH1" / "notes.txt").write_text("x")
+
+    planner = MigrationPlanner([migration_configs[0]], [migration_configs[1]])
+    assert planner.changed_templates() == {"work_files": "changed"}
+    seen = []
+    ops = list(planner.plan([root], progress=lambda n, t: seen.append(n)))
+    assert sorted(op.src for op in ops) == sorted(sources)
+    assert all(op.status == "rename" for op in ops)
+    assert seen[-1] == 5
+
+    report = planner.execute(ops)
+    assert report.renamed == 4
+    assert (root / "SH1" / "work" / "comp_SH1_v002.nk").read_text() == "SH1_comp_v002.nk"
+    assert not any(p.exists() for p in sources)
+
+def test_migration_collision_and_rollback(tmp_path, migration_configs):
+    root = tmp_path / "show"
+    (root / "SH1" / "work").mkdir(parents=True)
+    src = root / "SH1" / "work" / "SH1_comp_v001.nk"
+    src.write_text("a")
+    blocker = root / "SH1" / "work" / "comp_SH1_v001.nk"
+    blocker.write_text("b")
+    src2 = root / "SH1" / "work" / "SH1_comp_v002.nk"
+    src2.write_text("c")
+
+    planner = MigrationPlanner([migration_configs[0]], [migration_configs[1]])
+    ops = {op.src: op for op in planner.plan([root])}
+    assert ops[src].status == "collision"
+    assert ops[src2].status == "rename"
+
+    # Force a failure: the planned rename of src becomes a real one after
+    # src2 has moved, and must be undone.
+    forced = [ops[src2], RenameOp(src, blocker, "work_files")]
+    with pytest.raises(FileExistsError):
+        planner.execute(forced, max_workers=1)
+    assert src.read_text() == "a" and src2.read_text() == "c" and blocker.read_text() == "b"
+
+def _migration_tree(tmp_path, migration_configs):
+    root = tmp_path / "show"
+    sources = []
+    for shot in ("SH1", "SH2"):
+        src = root / shot / "work" / f"{shot}_comp_v001.nk"
+        src.parent.mkdir(parents=True)
+        src.write_text(shot)
+        sources.append(src)
+    planner = MigrationPlanner([migration_configs[0]], [migration_configs[1]])
+    return planner, sorted(planner.plan([root]), key=lambda op: op.src), sources
+
+def test_migration_rolls_back_on_any_exception(tmp_path, migration_configs, monkeypatch):
+    planner, ops, sources = _migration_tree(tmp_path, migration_configs)
+    real_rename = MigrationPlanner._rename
+
+    def rename(op):
+        if op.src == sources[1]:
+            raise KeyboardInterrupt
+        real_rename(op)
+
+    monkeypatch.setattr(MigrationPlanner, "_rename", staticmethod(rename))
+    with pytest.raises(KeyboardInterrupt):
+        planner.execute(ops, max_workers=1)
+    assert all(p.read_text() == p.parts[-3] for p in sources)
+    assert not any(op.dst.exists() for op in ops)
+
+def test_migration_reports_failed_rollback(tmp_path, migration_configs, monkeypatch):
+    planner, ops, sources = _migration_tree(tmp_path, migration_configs)
+    real_rename, real_os_rename = MigrationPlanner._rename, os.rename
+
+    def rename(op):
+        if op.src == sources[1]:
+            raise FileExistsError(op.dst)
+        real_rename(op)
+
+    def os_rename(src, dst):
+        if Path(dst) == sources[0]:
+            raise PermissionError(dst)
+        real_os_rename(src, dst)
+
+    monkeypatch.setattr(MigrationPlanner, "_rename", staticmethod(rename))
+    monkeypatch.setattr(os, "rename", os_rename)
+    with pytest.raises(MigrationRollbackError) as info:
+        planner.execute(ops, max_workers=1)
+    assert isinstance(info.value.__cause__, FileExistsError)
+    assert [op for op, _ in info.value.failures] == [ops[0]]
+    assert ops[0].dst.read_text() == "SH1"
+
+def test_migration_default_change(tmp_path):
+    old = tmp_path / "old.yaml"
+    new = tmp_path / "new.yaml"
+    write_yaml(old, {"templates": {"work_files": WORK_FILES}})
+    write_yaml(new, {"templates": {"work_files": dict(WORK_FILES, default_tokens={"work_dir": "wip"})}})
+    root = tmp_path / "show"
+    src = root / "SH1" / "work" / "SH1_comp_v001.nk"
+    src.parent.mkdir(parents=True)
+    src.write_text("a")
+    # an explicit work_dir that only happens to differ is left alone
+    other = root / "SH1" / "scratch" / "SH1_comp_v001.nk"
+    other.parent.mkdir()
+    other.write_text("b")
+
+    planner = MigrationPlanner([old], [new])
+    assert planner.changed_templates() == {"work_files": "changed"}
+    ops = list(planner.plan([root]))
+    assert [(op.src, op.dst) for op in ops] == [(src, root / "SH1" / "wip" / "SH1_comp_v001.nk")]
+
+
+# -----------------------------------------------------------------------------
+# CachingFileProbe
+# -----------------------------------------------------------------------------
+
+def test_probe_caches_positive_and_negative(tmp_path):
+    now = [0.0]
+    probe = CachingFileProbe(positive_ttl=10, negative_ttl=1, clock=lambda: now[0])
+    present = tmp_path / "a.yaml"
+    present.write_text("")
+    missing = tmp_path / "missing.yaml"
+
+    assert probe.exists_many([present, missing, present]) == [True, False, True]
+    assert probe.syscalls == 2
+    assert probe.exists(present) and not probe.exists(missing)
+    assert probe.syscalls == 2
+
+    missing.write_text("")
+    now[0] = 1.5          # negative entry expired, positive one still valid
+    assert probe.exists(missing) and probe.exists(present)
+    assert probe.syscalls == 3
+
+    probe.invalidate()
+    assert probe.exists(present)
+    assert probe.syscalls == 4
+
+def test_manager_build_reuses_probe(tmp_path):
+    studio = tmp_path / "std.yaml"
+    write_yaml(studio, {"templates": {}})
+    probe = CachingFileProbe()
+    pm = PathManagerFactory.create_for_show(studio, tmp_path / "root", "SHOW", probe=probe)
+    # studio + missing overrides, each stat'ed once despite four checks
+    assert pm.build_syscalls == 2
+    assert probe.syscalls == 2
+    again = PathManagerFactory.create_for_show(studio, tmp_path / "root", "SHOW", probe=probe)
+    assert again.build_syscalls == 0
+
+def test_build_syscalls_ignore_concurrent_builds(tmp_path):
+    studio = tmp_path / "std.yaml"
+    write_yaml(studio, {"templates": {}})
+    other = tmp_path / "other.yaml"
+    write_yaml(other, {"templates": {}})
+    probe = CachingFileProbe(positive_ttl=0, negative_ttl=0)
+    with probe.metered() as outer:
+        worker = threading.Thread(target=PathManager, args=([other],), kwargs={"probe": probe})
+        worker.start()
+        worker.join()
+        pm = PathManager([studio], probe=probe)
+    assert probe.syscalls == 4
+    assert pm.build_syscalls == 2
+    assert outer.syscalls == 2
+
+def test_load_config_probes_once(tmp_path, monkeypatch):
+    monkeypatch.delenv("USE_DEPLOYMENTS", raising=False)
+    project = tmp_path / "project.yaml"
+    write_yaml(project, {"templates": {"extra": {"pattern": "{root}"}}})
+    probe = CachingFileProbe()
+    load_config(str(project), probe=probe)
+    cfg = load_config(str(project), probe=probe)
+    assert "extra" in cfg.templates
+    assert probe.syscalls == 2
+
+
+# -----------------------------------------------------------------------------
+# TemplateTrie / batch generation helpers
+# -----------------------------------------------------------------------------
+
+def test_generate_set_matches_generate():
+    pm = PathManager([STUDIO_CFG])
+    names = [n for n in pm.get_templates() if not n.startswith("sg_")]
+    paths = pm.generate_set(names, SHOT_TOKENS)
+    assert paths == {n: pm.generate(n, SHOT_TOKENS) for n in names}
+
+def test_generate_many_versions():
+    pm = PathManager([STUDIO_CFG])
+    requests = [("work_files", dict(SHOT_TOKENS, version=v)) for v in range(1, 4)]
+    assert pm.generate_many(requests, os_name="linux") == [
+        pm.generate(n, t, os_name="linux") for n, t in requests]
+
+def test_generate_many_validates_transformed_columns():
+    calls = []
+
+    class SpyValidator(TokenValidatorStrategy):
+        def validate(self, template_name, tokens, tpl_conf):
+            calls.append((template_name, [tokens["descriptor"]]))
+            super().validate(template_name, tokens, tpl_conf)
+
+        def validate_batch(self, template_name, columns, tpl_conf):
+            calls.append((template_name, list(columns["descriptor"])))
+            super().validate_batch(template_name, columns, tpl_conf)
+
+    pm = PathManager([STUDIO_CFG], validator=SpyValidator())
+    # "FINAL" only passes the enum once it has been lowercased
+    requests = [("sg_version_name", dict(SHOT_TOKENS, descriptor="FINAL", version=v))
+                for v in (1, 2)]
+    requests.append(("work_files", SHOT_TOKENS))
+    pm.generate_many(requests)
+    assert calls == [("sg_version_name", ["final", "final"]), ("work_files", ["final"])]
+    with pytest.raises(ValueError):
+        pm.generate_many(requests + [("sg_version_name", dict(SHOT_TOKENS, descriptor="wip"))])
+
+def test_trie_candidates_branch_on_literals():
+    pm = PathManager([STUDIO_CFG])
+    trie = TemplateTrie(pm.get_templates())
+    path = pm.generate("precomp_render", SHOT_TOKENS).as_posix()
+    candidates = trie.candidates(path)
+    assert "precomp_render" in candidates
+    assert "work_files" not in candidates and "pub_dir" not in candidates
+    assert pm.parse(path)[0] == "precomp_render"
+
+
+# -----------------------------------------------------------------------------
+# PathManager.publish
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def publish_setup(tmp_path):
+    config = tmp_path / "pub.yaml"
+    write_yaml(config, {
+        "templates": {
+            "seq_files": {
+                "pattern": "{root}/{shotCode}/pub/{name}.{padding}.{ext}",
+                "required_tokens": ["root", "shotCode", "name", "ext"],
+                "optional_tokens": ["padding"],
+                "default_tokens": {"padding": 4},
+            },
+            "file": {
+                "pattern": "{root}/{shotCode}/pub/{name}.{ext}",
+                "required_tokens": ["root", "shotCode", "name", "ext"],
+            },
+        }
+    })
+    src = tmp_path / "render"
+    src.mkdir()
+    frames = []
+    for frame in (1001, 1002, 1003):
+        f = src / f"plate_v002.{frame}.exr"
+        f.write_bytes(bytes([frame % 256]) * (frame - 900))
+        frames.append(f)
+    tokens = {"root": (tmp_path / "show").as_posix(), "shotCode": "sh010", "name": "plate", "ext": "exr"}
+    return PathManager([config]), frames, tokens
+
+@pytest.mark.parametrize("mode", ["copy", "hardlink", "reflink"])
+def test_publish_sequence(publish_setup, mode):
+    pm, frames, tokens = publish_setup
+    report = pm.publish("seq_files", tokens, frames, mode=mode)
+    assert report.written == 3 and report.skipped == 0
+    for src, dst in zip(frames, report.destinations):
+        assert dst.name == f"plate.{src.name.split('.')[1]}.exr"
+        assert dst.read_bytes() == src.read_bytes()
+    assert not list(report.destinations[0].parent.glob(".*.tmp"))
+
+    again = pm.publish("seq_files", tokens, frames, mode=mode)
+    assert again.written == 0 and again.skipped == 3
+
+def test_publish_single_file_and_errors(publish_setup):
+    pm, frames, tokens = publish_setup
+    report = pm.publish("file", tokens, frames[:1])
+    assert report.destinations[0].read_bytes() == frames[0].read_bytes()
+    assert report.bytes == frames[0].stat().st_size
+    with pytest.raises(ValueError):
+        pm.publish("file", tokens, frames)
+    with pytest.raises(ValueError):
+        pm.publish("file", tokens, frames[:1], mode="move")
+
+@pytest.mark.parametrize("eye,expected", [("L", "l"), ("Right", "right")])
+def test_publish_stereo_uses_transformed_eye(tmp_path, publish_setup, eye, expected):
+    _, frames, _ = publish_setup
+    pm = PathManager([STUDIO_CFG])
+    tokens = dict(SHOT_TOKENS, root=(tmp_path / "show").as_posix(), ext="exr", eye=eye)
+    report = pm.publish("published_seq_stereo_files", tokens, frames)
+    assert [d.name for d in report.destinations] == [
+        f"TD0010_comp_v003_{expected}.{frame}.exr" for frame in (1001, 1002, 1003)]
+
+def test_publish_zero_byte_kernel_copy(publish_setup, monkeypatch):
+    pm, frames, tokens = publish_setup
+    # a filesystem that reports "0 bytes copied" instead of an error
+    monkeypatch.setattr(os, "copy_file_range", lambda *a: 0, raising=False)
+    monkeypatch.setattr(os, "sendfile", lambda *a: 0, raising=False)
+    report = pm.publish("file", tokens, frames[:1])
+    assert report.destinations[0].read_bytes() == frames[0].read_bytes()
+
+def test_publish_short_copy_raises(publish_setup, monkeypatch):
+    pm, frames, tokens = publish_setup
+    calls = []
+    def partial(src, dst, count, *a):
+        calls.append(count)
+        return 0 if len(calls) > 1 else os.write(dst, os.read(src, 10))
+    monkeypatch.setattr(os, "copy_file_range", partial, raising=False)
+    with pytest.raises(OSError, match="Short copy"):
+        pm.publish("file", tokens, frames[:1])
+    dst = pm.generate("file", tokens)
+    assert not dst.exists() and not list(dst.parent.glob(".*.tmp"))
+
+
+# -----------------------------------------------------------------------------
+# Preloading / shared template store
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def preloaded(tmp_path, simple_templates):
+    override = tmp_path / "root" / "SHOW" / "configs" / "overrides.yaml"
+    override.parent.mkdir(parents=True)
+    write_yaml(override, {"templates": {"run": {"transforms": {"task": ["lowercase"]}}}})
+    managers = preload_mod.preload(simple_templates, tmp_path / "root", ["SHOW"], freeze=False)
+    yield managers
+    preload_mod._PRELOADED.clear()
+
+def _generate_in_worker(show):
+    return str(preload_mod.get_manager(show).generate("run", {"task": "Foo"}))
+
+def test_preload_shared_with_forked_workers(preloaded):
+    import multiprocessing
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork start method not available")
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        assert pool.map(_generate_in_worker, ["SHOW", "SHOW"]) == ["foo/.dat", "foo/.dat"]
+    with pytest.raises(KeyError):
+        preload_mod.get_manager("OTHER")
+
+def test_shared_template_store_round_trip(preloaded):
+    store = SharedTemplateStore.create(preloaded)
+    try:
+        attached = SharedTemplateStore.attach(store.name)
+        pm = attached.manager("SHOW")
+        assert pm.get_templates() == preloaded["SHOW"].get_templates()
+        assert pm.generate("run", {"task": "Foo"}) == Path("foo/.dat")
+        assert attached.shows() == ["SHOW"]
+        with pytest.raises(KeyError):
+            attached.manager("OTHER")
+        attached.close()
+    finally:
+        store.close()
+
+
+# -----------------------------------------------------------------------------
+# Path manifests
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def show_manifest(tmp_path):
+    pm = PathManager([STUDIO_CFG])
+    entries = []
+    for shot in range(30):
+        for version in range(1, 6):
+            tokens = dict(SHOT_TOKENS, shotCode=f"sh{shot:04d}", version=version)
+            for name in ("work_files", "work_render", "published_files"):
+                entries.append((pm.generate(name, tokens), name, tokens))
+    target = tmp_path / "show.opm"
+    write_manifest(target, entries, block_size=16)
+    return target, entries
+
+def test_manifest_round_trip(show_manifest):
+    target, entries = show_manifest
+    # later entries for the same path (published_files has no version) win
+    latest = {p.as_posix(): (n, {k: str(v) for k, v in t.items()}) for p, n, t in entries}
+    expected = [(p, n, t) for p, (n, t) in sorted(latest.items())]
+    with ManifestReader(target) as reader:
+        assert len(reader) == len(expected)
+        assert [tuple(e) for e in reader] == expected
+        assert list(reader.paths()) == [e[0] for e in expected]
+        assert tuple(reader[37]) == expected[37]
+        assert tuple(reader[-1]) == expected[-1]
+
+def test_manifest_lookup(show_manifest):
+    target, entries = show_manifest
+    with ManifestReader(target) as reader:
+        for path, name, tokens in entries[::7]:
+            entry = reader.get(path)
+            assert entry.template == name
+            assert entry.tokens["shotCode"] == tokens["shotCode"]
+        assert "/nope" not in reader
+        assert reader.find("") == -1 and reader.find("￿") == -1
+
+def test_manifest_is_compact(show_manifest):
+    target, entries = show_manifest
+    as_json = json.dumps([[p.as_posix(), n, {k: str(v) for k, v in t.items()}]
+                          for p, n, t in entries])
+    assert target.stat().st_size * 4 < len(as_json)
+
+def test_manifest_rejects_other_files(tmp_path):
+    bogus = tmp_path / "bogus.opm"
+    bogus.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        ManifestReader(bogus)
+    with pytest.raises(ValueError):
+        ManifestWriter(tmp_path / "x.opm", block_size=0)